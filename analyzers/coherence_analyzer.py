@@ -2,6 +2,7 @@ import os
 from typing import List, Dict, Any
 from ai_collab_analyzer.analyzers.base_analyzer import BaseAnalyzer
 from ai_collab_analyzer.core.repository import Repository
+from ai_collab_analyzer.extractors.file_reader import BatchFileReader
 from ai_collab_analyzer.parsers.language_detector import LanguageDetector
 from ai_collab_analyzer.parsers.ast_parser import PythonASTParser
 from ai_collab_analyzer.similarity.code_similarity import CodeSimilarityAnalyzer
@@ -20,6 +21,7 @@ class CoherenceAnalyzer(BaseAnalyzer):
         # Increased default threshold to 90% and added min_length to CodeSimilarityAnalyzer
         self.similarity_analyzer = CodeSimilarityAnalyzer(threshold=similarity_threshold, min_length=100)
         self.pattern_matcher = PatternMatcher()
+        self.file_reader = BatchFileReader()
 
     @property
     def name(self) -> str:
@@ -37,25 +39,28 @@ class CoherenceAnalyzer(BaseAnalyzer):
         repo_path = repository.path
         
         # 1. Extract nodes from all supported files
+        python_files = []
         for root, _, files in os.walk(repo_path):
             for file in files:
                 filepath = os.path.join(root, file)
                 if LanguageDetector.detect_language(filepath) == "python":
-                    try:
-                        with open(filepath, 'r', encoding='utf-8') as f:
-                            code = f.read()
-                            nodes = self.python_parser.parse(code)
-                            for node in nodes:
-                                # Keep track of where this node came from
-                                node.filepath = os.path.relpath(filepath, repo_path)
-                                
-                                # Filtering: Ignore trivial/very small functions (boilerplate/getters)
-                                if len(node.body.splitlines()) < 6:
-                                    continue
-                                    
-                                all_nodes.append(node)
-                    except Exception:
+                    python_files.append(filepath)
+
+        # Read all Python sources in one concurrent batch; unreadable files are skipped
+        for filepath, code in self.file_reader.read_all(python_files).items():
+            try:
+                nodes = self.python_parser.parse(code)
+                for node in nodes:
+                    # Keep track of where this node came from
+                    node.filepath = os.path.relpath(filepath, repo_path)
+                    
+                    # Filtering: Ignore trivial/very small functions (boilerplate/getters)
+                    if len(node.body.splitlines()) < 6:
                         continue
+                        
+                    all_nodes.append(node)
+            except Exception:
+                continue
 
         # 2. Find near-duplicates
         # Optimization: Map IDs to bodies once to avoid O(n) lookup inside the loop
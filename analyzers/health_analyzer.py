@@ -4,7 +4,7 @@ from ai_collab_analyzer.analyzers.base_analyzer import BaseAnalyzer
 from ai_collab_analyzer.core.repository import Repository
 from ai_collab_analyzer.metrics.basic_metrics import MetricsCalculator
 
-@dataclass
+@dataclass(slots=True)
 class FileHotspot:
     """
     Represents a file identified as a hotspot.
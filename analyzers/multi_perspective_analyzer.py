@@ -1,21 +1,37 @@
+import heapq
 import os
-from typing import List, Dict, Any, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Dict, Any, Tuple, Optional
 from ai_collab_analyzer.analyzers.base_analyzer import BaseAnalyzer
 from ai_collab_analyzer.core.repository import Repository
+from ai_collab_analyzer.extractors.file_reader import BatchFileReader
 from ai_collab_analyzer.models.perspectives import MultiPerspectiveResult, PerspectiveResult, DimensionScore, CodeEntity, Finding, Severity
 from ai_collab_analyzer.perspectives.structural_perspective import StructuralPerspective
 from ai_collab_analyzer.perspectives.semantic_perspective import SemanticPerspective
 from ai_collab_analyzer.perspectives.performance_perspective import PerformancePerspective
 from ai_collab_analyzer.perspectives.security_perspective import SecurityPerspective
 
+def _run_perspectives(perspectives: List[Any], entity: CodeEntity) -> Optional[List[PerspectiveResult]]:
+    """
+    Run every perspective on a single entity. Module-level so it can be
+    dispatched to worker processes.
+    """
+    try:
+        return [p.analyze(entity) for p in perspectives]
+    except Exception:
+        return None
+
 class MultiPerspectiveAnalyzer(BaseAnalyzer):
     """
     Coordinator for multi-dimensional code analysis.
     Runs multiple perspectives and aggregates results.
     """
     
-    def __init__(self):
+    def __init__(self, max_workers: Optional[int] = None):
         super().__init__()
+        # Files are sharded across worker processes, each running all perspectives
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.file_reader = BatchFileReader(errors='ignore')
         self.perspectives = [
             StructuralPerspective(),
             SemanticPerspective(),
@@ -36,30 +52,28 @@ class MultiPerspectiveAnalyzer(BaseAnalyzer):
         Analyze all files in the repository across all perspectives.
         """
         all_file_results: Dict[str, List[PerspectiveResult]] = {}
+        full_paths: Dict[str, str] = {}
         
-        # 1. Analyze Each File
+        # 1. Load Each File
         for filepath in repository.files:
-            full_path = os.path.join(repository.path, filepath)
-            if not os.path.exists(full_path) or not os.path.isfile(full_path):
-                continue
-                
             # Only analyze supported files (Python for now)
             if not filepath.endswith('.py'):
                 continue
 
-            try:
-                with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
-                    content = f.read()
-                    
-                entity = CodeEntity(filepath=filepath, content=content)
-                file_results = []
-                for p in self.perspectives:
-                    res = p.analyze(entity)
-                    file_results.append(res)
-                
-                all_file_results[filepath] = file_results
-            except Exception:
+            full_path = os.path.join(repository.path, filepath)
+            if not os.path.exists(full_path) or not os.path.isfile(full_path):
                 continue
+                
+            full_paths[full_path] = filepath
+
+        # Read all candidate files in one concurrent batch
+        contents = self.file_reader.read_all(list(full_paths))
+        entities = [CodeEntity(filepath=full_paths[path], content=content) for path, content in contents.items()]
+
+        # Analyze files (in parallel when there is more than one)
+        for entity, file_results in zip(entities, self._analyze_entities(entities)):
+            if file_results is not None:
+                all_file_results[entity.filepath] = file_results
 
         # 2. Aggregate Results
         perspective_scores: Dict[str, List[float]] = {}
@@ -115,15 +129,30 @@ class MultiPerspectiveAnalyzer(BaseAnalyzer):
         # Calculate final composite score
         composite_score = sum(avg_perspective_scores.values()) / len(avg_perspective_scores) if avg_perspective_scores else 100.0
 
-        # Extract critical findings (HIGH or CRITICAL)
-        critical_findings = [f for f in all_findings if f.severity in (Severity.HIGH, Severity.CRITICAL)]
-        # Dedup or limit critical findings
-        critical_findings.sort(key=lambda x: 1 if x.severity == Severity.CRITICAL else 2)
+        # Extract critical findings (HIGH or CRITICAL), keeping only the most severe
+        critical_findings = heapq.nlargest(20, (f for f in all_findings if f.severity >= Severity.HIGH), key=lambda x: x.severity)
 
         return MultiPerspectiveResult(
             aggregate_scores=avg_perspective_scores,
             perspective_results=aggregate_perspective_results,
             composite_score=composite_score,
-            critical_findings=critical_findings[:20], # Top 20 critical issues
+            critical_findings=critical_findings, # Top 20 critical issues
             file_breakdown=file_breakdown
         )
+
+    def _analyze_entities(self, entities: List[CodeEntity]) -> List[Optional[List[PerspectiveResult]]]:
+        """
+        Run all perspectives over the entities, sharding files across a process pool.
+        The AST walks are CPU-bound and hold the GIL, so threads would not help here.
+        """
+        if self.max_workers <= 1 or len(entities) < 2:
+            return [_run_perspectives(self.perspectives, e) for e in entities]
+
+        workers = min(self.max_workers, len(entities))
+        chunksize = max(1, len(entities) // (workers * 4))
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                return list(executor.map(_run_perspectives, [self.perspectives] * len(entities), entities, chunksize=chunksize))
+        except (OSError, RuntimeError):
+            # Process pools are unavailable in some sandboxes; fall back to serial analysis
+            return [_run_perspectives(self.perspectives, e) for e in entities]
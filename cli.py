@@ -27,6 +27,11 @@ class CLI:
         analyze_parser = subparsers.add_parser('analyze', help='Analyze a repository')
         analyze_parser.add_argument('path', help='Path to git repository')
         analyze_parser.add_argument('--output', '-o', default='report.html', help='Output path for report')
+        analyze_parser.add_argument('--include-raw-data', action='store_true', help='Embed the raw hotspot JSON in the report')
+        analyze_parser.add_argument('--static-charts', action='store_true',
+                                    help='Render the radar, hotspot and coupling charts as inline SVG (requires kaleido)')
+        analyze_parser.add_argument('--plotly-js', choices=['directory', 'inline', 'cdn'], default='directory',
+                                    help='Load plotly.js from a bundle next to the report, inline it, or use the pinned CDN build')
         
         # Serve command
         serve_parser = subparsers.add_parser('serve', help='Launch interactive dashboard')
@@ -37,7 +42,8 @@ class CLI:
         
         return parser.parse_args()
         
-    def run_analysis(self, repo_path: str, output_path: str):
+    def run_analysis(self, repo_path: str, output_path: str, include_raw_data: bool = False, plotly_js: str = "directory",
+                     static_charts: bool = False):
         print(f"Analyzing repository at: {repo_path}")
         
         try:
@@ -123,6 +129,7 @@ class CLI:
             db = DatabaseManager()
             repo_name = os.path.basename(os.path.abspath(repo_path))
             from dataclasses import asdict, is_dataclass
+            from enum import Enum
             
             def make_serializable(obj):
                 if isinstance(obj, (list, tuple)):
@@ -131,6 +138,10 @@ class CLI:
                     return {k: make_serializable(v) for k, v in obj.items()}
                 if is_dataclass(obj):
                     return make_serializable(asdict(obj))
+                if isinstance(obj, Enum):
+                    # Stored as "Severity.HIGH", as before severities became IntEnums,
+                    # so old and new rows agree and ints never leak into full_data
+                    return f"{type(obj).__name__}.{obj.name}"
                 if isinstance(obj, (datetime, date)):
                     return obj.isoformat()
                 try:
@@ -146,9 +157,9 @@ class CLI:
 
             # 4. Report
             print("Step 4/4: Generating report...")
-            reporter = HTMLReporter()
-            html = reporter.generate_report(repository, result)
-            reporter.save_report(html, output_path)
+            reporter = HTMLReporter(static_charts=static_charts)
+            result["include_raw_data"] = include_raw_data
+            reporter.write_report(repository, result, output_path, plotly_js)
             print(f"  Report saved to: {output_path}")
             
             print("\nAnalysis Success!")
@@ -198,7 +209,7 @@ def main():
     args = cli.parse_arguments()
     
     if args.command == 'analyze':
-        cli.run_analysis(args.path, args.output)
+        cli.run_analysis(args.path, args.output, args.include_raw_data, args.plotly_js, args.static_charts)
     elif args.command == 'serve':
         cli.handle_serve()
     elif args.command == 'compare':
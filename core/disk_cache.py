@@ -0,0 +1,45 @@
+import os
+import tempfile
+
+def write_atomic(path: str, data: bytes):
+    """
+    Write data to path through a temp file in the same directory and os.replace,
+    so concurrent readers see either the old file or the complete new one.
+    """
+    directory = os.path.dirname(path)
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+def touch(path: str):
+    # Mark a cache hit so pruning keeps recently used entries
+    try:
+        os.utime(path)
+    except OSError:
+        pass
+
+def prune(directory: str, max_files: int):
+    """
+    Delete the least recently used files until at most max_files remain.
+    """
+    try:
+        entries = [e for e in os.scandir(directory) if e.is_file()]
+    except OSError:
+        return
+    if len(entries) <= max_files:
+        return
+    entries.sort(key=lambda e: e.stat().st_mtime)
+    for entry in entries[:len(entries) - max_files]:
+        try:
+            os.unlink(entry.path)
+        except OSError:
+            pass
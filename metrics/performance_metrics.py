@@ -1,5 +1,61 @@
 import ast
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterator
+from ai_collab_analyzer.parsers.ast_visitor import DispatchVisitor
+
+class _YieldingVisitor(DispatchVisitor):
+    """
+    Visitor whose handlers are generators, so findings are yielded as the walk
+    reaches them instead of being collected into a list first.
+    """
+
+    def generic_visit(self, node):
+        for child in ast.iter_child_nodes(node):
+            yield from self.visit(child)
+
+class _RecursionVisitor(_YieldingVisitor):
+    """Yields the first direct self-call inside each function."""
+
+    def __init__(self):
+        # Enclosing functions as [name, already_reported]
+        self._frames: List[list] = []
+
+    def _visit_function(self, node):
+        self._frames.append([node.name, False])
+        yield from self.generic_visit(node)
+        self._frames.pop()
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _visit_function
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name):
+            for frame in self._frames:
+                if not frame[1] and frame[0] == node.func.id:
+                    frame[1] = True
+                    yield {
+                        "name": frame[0],
+                        "line_number": node.lineno
+                    }
+        yield from self.generic_visit(node)
+
+class _ResourceVisitor(_YieldingVisitor):
+    """Yields open() calls that are not the context expression of a 'with' item."""
+
+    def __init__(self):
+        self._managed = set()
+
+    def visit_withitem(self, node):
+        self._managed.add(id(node.context_expr))
+        yield from self.generic_visit(node)
+
+    def visit_Call(self, node):
+        if isinstance(node.func, ast.Name) and node.func.id == 'open' and id(node) not in self._managed:
+            # Assigned resources might be closed later, but 'with' is preferred.
+            yield {
+                "operation": "open",
+                "line_number": node.lineno,
+                "recommendation": "Use 'with' statement for resource management."
+            }
+        yield from self.generic_visit(node)
 
 class PerformanceMetricsCalculator:
     """
@@ -15,56 +71,53 @@ class PerformanceMetricsCalculator:
         """
         Identify deeply nested loops (potential O(n^k) complexity).
         """
-        hotspots = []
-        
+        return list(self.iter_nested_loops(tree))
+
+    def iter_nested_loops(self, tree: ast.AST) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield deeply nested loops so callers can bound what they keep.
+        """
         def check_nesting(node, depth):
             if isinstance(node, (ast.For, ast.While, ast.AsyncFor)):
                 depth += 1
                 if depth >= 2:
-                    hotspots.append({
+                    yield {
                         "line_number": node.lineno,
                         "depth": depth,
                         "type": type(node).__name__
-                    })
+                    }
                 
-                for child in ast.iter_child_nodes(node):
-                    check_nesting(child, depth)
-            else:
-                for child in ast.iter_child_nodes(node):
-                    check_nesting(child, depth)
+            for child in ast.iter_child_nodes(node):
+                yield from check_nesting(child, depth)
 
-        check_nesting(tree, 0)
-        return hotspots
+        return check_nesting(tree, 0)
 
     def detect_recursion(self, tree: ast.AST) -> List[Dict[str, Any]]:
         """
         Detect simple direct recursion.
         """
-        recursion_points = []
-        
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                func_name = node.name
-                for child in ast.walk(node):
-                    if isinstance(child, ast.Call) and isinstance(child.func, ast.Name):
-                        if child.func.id == func_name:
-                            recursion_points.append({
-                                "name": func_name,
-                                "line_number": child.lineno
-                            })
-                            break
-        return recursion_points
+        return list(self.iter_recursion(tree))
+
+    def iter_recursion(self, tree: ast.AST) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield simple direct recursion points.
+        """
+        return _RecursionVisitor().visit(tree)
 
     def analyze_io_in_loops(self, tree: ast.AST) -> List[Dict[str, Any]]:
         """
         Detect I/O operations inside loops.
         """
-        io_in_loops = []
-        
+        return list(self.iter_io_in_loops(tree))
+
+    def iter_io_in_loops(self, tree: ast.AST) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield I/O operations found inside loops.
+        """
         def find_io(node, in_loop=False):
             if isinstance(node, (ast.For, ast.While, ast.AsyncFor)):
                 for child in ast.iter_child_nodes(node):
-                    find_io(child, in_loop=True)
+                    yield from find_io(child, in_loop=True)
             elif isinstance(node, ast.Call) and in_loop:
                 func_name = ""
                 if isinstance(node.func, ast.Name):
@@ -73,45 +126,28 @@ class PerformanceMetricsCalculator:
                     func_name = node.func.attr
                 
                 if any(keyword in func_name.lower() for keyword in self.IO_KEYWORDS):
-                    io_in_loops.append({
+                    yield {
                         "operation": func_name,
                         "line_number": node.lineno
-                    })
+                    }
                 
                 # Still continue walk as there might be nested loops
                 for child in ast.iter_child_nodes(node):
-                    find_io(child, in_loop)
+                    yield from find_io(child, in_loop)
             else:
                 for child in ast.iter_child_nodes(node):
-                    find_io(child, in_loop)
+                    yield from find_io(child, in_loop)
 
-        find_io(tree)
-        return io_in_loops
+        return find_io(tree)
 
     def check_resource_management(self, tree: ast.AST) -> List[Dict[str, Any]]:
         """
         Detect unclosed resources (e.g., open() without 'with').
         """
-        issues = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id == 'open':
-                # Check if this call is an expression or assignment not in a 'with'
-                # This is a basic heuristic
-                parent = self._get_parent(tree, node)
-                if not isinstance(parent, ast.withitem):
-                    # Check if it's assigned to a variable that might be closed later
-                    # but 'with' is preferred.
-                    issues.append({
-                        "operation": "open",
-                        "line_number": node.lineno,
-                        "recommendation": "Use 'with' statement for resource management."
-                    })
-        return issues
+        return list(self.iter_resource_issues(tree))
 
-    def _get_parent(self, root, target):
-        """Helper to find parent of a node."""
-        for node in ast.walk(root):
-            for child in ast.iter_child_nodes(node):
-                if child is target:
-                    return node
-        return None
+    def iter_resource_issues(self, tree: ast.AST) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield unclosed resources.
+        """
+        return _ResourceVisitor().visit(tree)
@@ -1,6 +1,17 @@
 import ast
 import re
 from typing import List, Dict, Any
+from ai_collab_analyzer.parsers.ast_visitor import DispatchVisitor
+
+class _CallVisitor(DispatchVisitor):
+    """Hands every Call node in the tree to a callback."""
+
+    def __init__(self, on_call):
+        self.on_call = on_call
+
+    def visit_Call(self, node):
+        self.on_call(node)
+        self.generic_visit(node)
 
 class SecurityMetricsCalculator:
     """
@@ -18,6 +29,10 @@ class SecurityMetricsCalculator:
         r"---" + r"--BEGIN RSA PRIVATE KEY-----", # SSH Private Key
     ]
 
+    # Lowercase substrings at least one of which every SECRET_PATTERNS match must contain.
+    # Files containing none of them cannot match, so the regex scan is skipped entirely.
+    SECRET_MARKERS = ("key", "token", "password", "aiza", "sk_", "sq0atp-")
+
     VULNERABLE_FUNCTIONS = {
         'eval': 'eval() can execute arbitrary code.',
         'exec': 'exec() can execute arbitrary code.',
@@ -33,6 +48,10 @@ class SecurityMetricsCalculator:
         Scan code for potential secrets using regex.
         """
         secrets = []
+        lowered = content.lower()
+        if not any(marker in lowered for marker in self.SECRET_MARKERS):
+            return secrets
+
         lines = content.splitlines()
         for i, line in enumerate(lines):
             for pattern in self.SECRET_PATTERNS:
@@ -50,36 +69,37 @@ class SecurityMetricsCalculator:
         Scan AST for usage of potentially insecure functions.
         """
         vulnerabilities = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Call):
-                func_name = ""
-                if isinstance(node.func, ast.Name):
-                    func_name = node.func.id
-                elif isinstance(node.func, ast.Attribute):
-                    # Handle cases like pickle.loads
-                    if isinstance(node.func.value, ast.Name):
-                        func_name = f"{node.func.value.id}.{node.func.attr}"
-                    else:
-                        func_name = node.func.attr
 
-                if func_name in self.VULNERABLE_FUNCTIONS:
-                    # Special check for shell=True in subprocess
-                    is_shell_true = False
-                    if func_name == 'subprocess.Popen':
-                        for keyword in node.keywords:
-                            if keyword.arg == 'shell' and isinstance(keyword.value, ast.Constant) and keyword.value.value is True:
-                                is_shell_true = True
-                    
-                    description = self.VULNERABLE_FUNCTIONS[func_name]
-                    if is_shell_true:
-                        description += " Specifically shell=True is detected."
+        def check_call(node):
+            func_name = ""
+            if isinstance(node.func, ast.Name):
+                func_name = node.func.id
+            elif isinstance(node.func, ast.Attribute):
+                # Handle cases like pickle.loads
+                if isinstance(node.func.value, ast.Name):
+                    func_name = f"{node.func.value.id}.{node.func.attr}"
+                else:
+                    func_name = node.func.attr
 
-                    vulnerabilities.append({
-                        "line_number": node.lineno,
-                        "function": func_name,
-                        "description": description
-                    })
+            if func_name in self.VULNERABLE_FUNCTIONS:
+                # Special check for shell=True in subprocess
+                is_shell_true = False
+                if func_name == 'subprocess.Popen':
+                    for keyword in node.keywords:
+                        if keyword.arg == 'shell' and isinstance(keyword.value, ast.Constant) and keyword.value.value is True:
+                            is_shell_true = True
+                
+                description = self.VULNERABLE_FUNCTIONS[func_name]
+                if is_shell_true:
+                    description += " Specifically shell=True is detected."
+
+                vulnerabilities.append({
+                    "line_number": node.lineno,
+                    "function": func_name,
+                    "description": description
+                })
 
+        _CallVisitor(check_call).visit(tree)
         return vulnerabilities
 
     def analyze_module_security(self, tree: ast.AST) -> Dict[str, Any]:
@@ -91,20 +111,20 @@ class SecurityMetricsCalculator:
             "suspicious_imports": []
         }
         
-        for node in ast.walk(tree):
+        def check_call(node):
             # Detect __import__ or importlib.import_module
-            if isinstance(node, ast.Call):
-                func_name = ""
-                if isinstance(node.func, ast.Name):
-                    func_name = node.func.id
-                elif isinstance(node.func, ast.Attribute):
-                    func_name = node.func.attr
-                
-                if func_name in ('__import__', 'import_module'):
-                    stats["dynamic_imports"] += 1
-                    stats["suspicious_imports"].append({
-                        "line_number": node.lineno,
-                        "type": "dynamic_import"
-                    })
-                    
+            func_name = ""
+            if isinstance(node.func, ast.Name):
+                func_name = node.func.id
+            elif isinstance(node.func, ast.Attribute):
+                func_name = node.func.attr
+            
+            if func_name in ('__import__', 'import_module'):
+                stats["dynamic_imports"] += 1
+                stats["suspicious_imports"].append({
+                    "line_number": node.lineno,
+                    "type": "dynamic_import"
+                })
+
+        _CallVisitor(check_call).visit(tree)
         return stats
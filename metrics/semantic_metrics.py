@@ -1,6 +1,43 @@
 import ast
 import re
 from typing import List, Dict, Any, Set
+from ai_collab_analyzer.parsers.ast_visitor import DispatchVisitor
+
+class _IdentifierVisitor(DispatchVisitor):
+    """Collects (name, kind, line) for every identifier defined in the tree."""
+
+    def __init__(self):
+        self.identifiers = []
+
+    def visit_Name(self, node):
+        if isinstance(node.ctx, ast.Store):
+            self.identifiers.append((node.id, "variable", node.lineno))
+
+    def _visit_function(self, node):
+        self.identifiers.append((node.name, "function", node.lineno))
+        self.generic_visit(node)
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _visit_function
+
+    def visit_ClassDef(self, node):
+        self.identifiers.append((node.name, "class", node.lineno))
+        self.generic_visit(node)
+
+    def visit_arg(self, node):
+        self.identifiers.append((node.arg, "argument", node.lineno))
+        self.generic_visit(node)
+
+class _DocumentableVisitor(DispatchVisitor):
+    """Collects class and function definitions."""
+
+    def __init__(self):
+        self.nodes = []
+
+    def _visit_definition(self, node):
+        self.nodes.append(node)
+        self.generic_visit(node)
+
+    visit_ClassDef = visit_FunctionDef = visit_AsyncFunctionDef = _visit_definition
 
 class SemanticMetricsCalculator:
     """
@@ -16,16 +53,9 @@ class SemanticMetricsCalculator:
         """
         Extract and analyze all identifiers (variables, functions, classes).
         """
-        identifiers = []
-        for node in ast.walk(tree):
-            if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
-                identifiers.append((node.id, "variable", node.lineno))
-            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                identifiers.append((node.name, "function", node.lineno))
-            elif isinstance(node, ast.ClassDef):
-                identifiers.append((node.name, "class", node.lineno))
-            elif isinstance(node, ast.arg):
-                identifiers.append((node.arg, "argument", node.lineno))
+        visitor = _IdentifierVisitor()
+        visitor.visit(tree)
+        identifiers = visitor.identifiers
 
         stats = {
             "total_count": len(identifiers),
@@ -61,14 +91,15 @@ class SemanticMetricsCalculator:
         documented_count = 0
         missing = []
 
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.ClassDef, ast.FunctionDef, ast.AsyncFunctionDef)):
-                total_documentable += 1
-                doc = ast.get_docstring(node)
-                if doc and doc.strip():
-                    documented_count += 1
-                else:
-                    missing.append((node.name, type(node).__name__, node.lineno))
+        visitor = _DocumentableVisitor()
+        visitor.visit(tree)
+        for node in visitor.nodes:
+            total_documentable += 1
+            doc = ast.get_docstring(node)
+            if doc and doc.strip():
+                documented_count += 1
+            else:
+                missing.append((node.name, type(node).__name__, node.lineno))
 
         coverage = (documented_count / total_documentable) if total_documentable > 0 else 1.0
         return {
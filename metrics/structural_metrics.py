@@ -1,5 +1,36 @@
 import ast
 from typing import Dict, Any, List, Optional
+from ai_collab_analyzer.parsers.ast_visitor import DispatchVisitor
+
+class _ComplexityVisitor(DispatchVisitor):
+    """Counts decision points for cyclomatic complexity."""
+
+    def __init__(self):
+        self.decisions = 0
+
+    def _visit_decision(self, node):
+        self.decisions += 1
+        self.generic_visit(node)
+
+    visit_If = visit_While = visit_For = visit_AsyncFor = _visit_decision
+    visit_With = visit_AsyncWith = visit_ExceptHandler = visit_Try = visit_Assert = _visit_decision
+    visit_And = visit_Or = _visit_decision
+
+    def visit_BoolOp(self, node):
+        self.decisions += len(node.values) - 1
+        self.generic_visit(node)
+
+class _FunctionVisitor(DispatchVisitor):
+    """Collects function definitions, including nested ones."""
+
+    def __init__(self):
+        self.functions = []
+
+    def _visit_function(self, node):
+        self.functions.append(node)
+        self.generic_visit(node)
+
+    visit_FunctionDef = visit_AsyncFunctionDef = _visit_function
 
 class StructuralMetricsCalculator:
     """
@@ -11,14 +42,9 @@ class StructuralMetricsCalculator:
         Calculate cyclomatic complexity of a given AST node.
         Complexity = Number of decision points + 1.
         """
-        complexity = 1
-        for child in ast.walk(node):
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor, ast.With, ast.AsyncWith,
-                                 ast.And, ast.Or, ast.ExceptHandler, ast.Try, ast.Assert)):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp):
-                complexity += len(child.values) - 1
-        return complexity
+        visitor = _ComplexityVisitor()
+        visitor.visit(node)
+        return 1 + visitor.decisions
 
     def calculate_nesting_depth(self, node: ast.AST) -> int:
         """
@@ -47,17 +73,18 @@ class StructuralMetricsCalculator:
         except SyntaxError:
             return []
             
-        metrics = []
-        for node in ast.walk(tree):
-            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                metrics.append({
-                    "name": node.name,
-                    "type": "function",
-                    "complexity": self.calculate_cyclomatic_complexity(node),
-                    "nesting": self.calculate_nesting_depth(node),
-                    "line_number": node.lineno
-                })
-        return metrics
+        visitor = _FunctionVisitor()
+        visitor.visit(tree)
+        return [
+            {
+                "name": node.name,
+                "type": "function",
+                "complexity": self.calculate_cyclomatic_complexity(node),
+                "nesting": self.calculate_nesting_depth(node),
+                "line_number": node.lineno
+            }
+            for node in visitor.functions
+        ]
 
     def calculate_maintainability_index(self, complexity: int, loc: int, comment_weight: float = 0.2) -> float:
         """
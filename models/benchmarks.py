@@ -20,4 +20,6 @@ class PortfolioMetrics:
     avg_risk_score: float
     top_risky_files: List[Dict[str, Any]] = field(default_factory=list)
     repo_comparisons: List[Dict[str, Any]] = field(default_factory=list)
+    # repo_comparisons as columns ('name', 'health', 'coherence', 'risk'), ready to chart
+    comparison_series: Dict[str, List[Any]] = field(default_factory=dict)
     timestamp: datetime = field(default_factory=datetime.utcnow)
@@ -1,21 +1,32 @@
+import sys
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
-from enum import Enum
+from enum import IntEnum
 
-class Severity(Enum):
-    LOW = "low"
-    MEDIUM = "medium"
-    HIGH = "high"
-    CRITICAL = "critical"
+class Severity(IntEnum):
+    # Ordinal values so severities compare and sort as plain ints
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    CRITICAL = 4
 
-@dataclass
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+@dataclass(slots=True)
 class CodeLocation:
     filepath: str
     line_start: int
     line_end: int
     entity_name: Optional[str] = None
 
-@dataclass
+    def __post_init__(self):
+        # Every finding in a file repeats the same path; share a single string object
+        if isinstance(self.filepath, str):
+            self.filepath = sys.intern(self.filepath)
+
+@dataclass(slots=True)
 class Finding:
     title: str
     description: str
@@ -24,7 +35,7 @@ class Finding:
     recommendation: Optional[str] = None
     metadata: Dict[str, Any] = field(default_factory=dict)
 
-@dataclass
+@dataclass(slots=True)
 class DimensionScore:
     name: str
     score: float  # 0 to 100
@@ -2,13 +2,13 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 from datetime import datetime
 
-@dataclass
+@dataclass(slots=True)
 class RiskFactor:
     name: str
     weight: float
     description: str
 
-@dataclass
+@dataclass(slots=True)
 class FileRiskScore:
     filepath: str
     score: float  # 0 to 100
@@ -16,7 +16,7 @@ class FileRiskScore:
     factors: List[RiskFactor] = field(default_factory=list)
     trend: str = "stable"  # increasing, decreasing, stable
 
-@dataclass
+@dataclass(slots=True)
 class TrendPoint:
     timestamp: datetime
     value: float
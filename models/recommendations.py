@@ -1,15 +1,20 @@
 from dataclasses import dataclass, field
-from enum import Enum
+from enum import IntEnum
 from typing import List, Dict, Any, Optional
 
-class RecommendationSeverity(Enum):
-    CRITICAL = "critical"
-    HIGH = "high"
-    MEDIUM = "medium"
-    LOW = "low"
-    INFO = "info"
+class RecommendationSeverity(IntEnum):
+    # Ordinal values so severities compare and sort as plain ints
+    CRITICAL = 4
+    HIGH = 3
+    MEDIUM = 2
+    LOW = 1
+    INFO = 0
 
-@dataclass
+    @property
+    def label(self) -> str:
+        return self.name.lower()
+
+@dataclass(slots=True)
 class ActionableInsight:
     """Represents a concrete recommendation based on analysis patterns."""
     title: str
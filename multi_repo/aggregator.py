@@ -1,4 +1,5 @@
 from typing import List, Dict, Any
+import heapq
 from ai_collab_analyzer.models.benchmarks import PortfolioMetrics
 from ai_collab_analyzer.storage.database import DatabaseManager
 
@@ -10,23 +11,18 @@ class MultiRepoAggregator:
         self.db = db
 
     def aggregate_portfolio(self) -> PortfolioMetrics:
-        repos = self.db.list_repositories()
-        if not repos:
-            return PortfolioMetrics(0, 0, 0, 0)
+        # Latest analysis of every repository in a single query
+        latest_results = self.db.iter_latest_results()
 
         total_health = 0
         total_coherence = 0
         total_risk = 0
         all_risky_files = []
         comparisons = []
+        series = {'name': [], 'health': [], 'coherence': [], 'risk': []}
 
         active_repos = 0
-        for repo in repos:
-            latest = self.db.get_latest_results(repo.name, limit=1)
-            if not latest:
-                continue
-            
-            res = latest[0]
+        for repo, res in latest_results:
             active_repos += 1
             total_health += res.health_score or 0
             total_coherence += res.coherence_score or 0
@@ -60,18 +56,21 @@ class MultiRepoAggregator:
                 'coherence': res.coherence_score,
                 'risk': res.risk_score
             })
+            for key, value in comparisons[-1].items():
+                series[key].append(value)
 
         if active_repos == 0:
             return PortfolioMetrics(0, 0, 0, 0)
 
-        # Sort all risky files across portfolio
-        all_risky_files.sort(key=lambda x: x['risk_score'], reverse=True)
+        # Top risky files across portfolio; same order as a full descending sort
+        top_risky_files = heapq.nlargest(10, all_risky_files, key=lambda x: x['risk_score'])
 
         return PortfolioMetrics(
             total_repos=active_repos,
             avg_health_score=total_health / active_repos,
             avg_coherence_score=total_coherence / active_repos,
             avg_risk_score=total_risk / active_repos,
-            top_risky_files=all_risky_files[:10],
-            repo_comparisons=comparisons
+            top_risky_files=top_risky_files,
+            repo_comparisons=comparisons,
+            comparison_series=series
         )
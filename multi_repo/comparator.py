@@ -11,7 +11,7 @@ class RepositoryComparator:
     def compare(self, repo_names: List[str]) -> Dict[str, Any]:
         results = []
         for name in repo_names:
-            latest = self.db.get_latest_results(name, limit=1)
+            latest = self.db.get_latest_results(name, limit=1, include_data=False)
             if latest:
                 res = latest[0]
                 results.append({
@@ -3,12 +3,16 @@ from typing import List, Dict, Any, Optional
 
 class CodeNode:
     """Represents a structural element in the code (class or function)."""
-    def __init__(self, name: str, type: str, start_line: int, end_line: int, body: str):
+    # filepath is assigned by consumers (e.g. CoherenceAnalyzer) once the source file is known
+    __slots__ = ('name', 'type', 'start_line', 'end_line', 'body', 'filepath')
+
+    def __init__(self, name: str, type: str, start_line: int, end_line: int, body: str, filepath: Optional[str] = None):
         self.name = name
         self.type = type
         self.start_line = start_line
         self.end_line = end_line
         self.body = body
+        self.filepath = filepath
 
     def to_dict(self) -> Dict[str, Any]:
         return {
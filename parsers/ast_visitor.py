@@ -0,0 +1,24 @@
+import ast
+from typing import Any, Callable, Dict
+
+class DispatchVisitor(ast.NodeVisitor):
+    """
+    NodeVisitor that resolves the visit_<NodeClass> handler once per node class.
+    The stock NodeVisitor builds the method name and calls getattr on every node;
+    caching the handler brings a visitor roughly on par with an ast.walk loop.
+    """
+
+    _dispatch: Dict[type, Callable[..., Any]] = {}
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        # Each visitor class gets its own handler cache
+        cls._dispatch = {}
+
+    def visit(self, node: ast.AST) -> Any:
+        node_cls = node.__class__
+        handler = self._dispatch.get(node_cls)
+        if handler is None:
+            handler = getattr(type(self), 'visit_' + node_cls.__name__, type(self).generic_visit)
+            self._dispatch[node_cls] = handler
+        return handler(self, node)
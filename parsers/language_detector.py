@@ -23,18 +23,42 @@ class LanguageDetector:
         '.md': 'markdown'
     }
 
+    # Lookup table precomputed at class load with lower- and upper-case keys, so the
+    # common case needs neither os.path.splitext nor a lowercased copy of the extension
+    _EXT_LOOKUP = {**EXTENSION_MAP, **{ext.upper(): lang for ext, lang in EXTENSION_MAP.items()}}
+
+    @staticmethod
+    def _extension(filepath: str) -> str:
+        """
+        Same result as os.path.splitext(filepath)[1], without building the root part.
+        """
+        dot = filepath.rfind('.')
+        start = filepath.rfind(os.sep) + 1
+        if os.altsep:
+            start = max(start, filepath.rfind(os.altsep) + 1)
+        # No dot in the file name, or the name only starts with dots (e.g. '.bashrc')
+        if dot < start or filepath.count('.', start, dot) == dot - start:
+            return ''
+        return filepath[dot:]
+
+    @classmethod
+    def _lookup(cls, filepath: str) -> Optional[str]:
+        ext = cls._extension(filepath)
+        lang = cls._EXT_LOOKUP.get(ext)
+        if lang is None and ext:
+            lang = cls.EXTENSION_MAP.get(ext.lower())
+        return lang
+
     @classmethod
     def detect_language(cls, filepath: str) -> Optional[str]:
         """
         Detects the language of a file based on its extension.
         """
-        _, ext = os.path.splitext(filepath)
-        return cls.EXTENSION_MAP.get(ext.lower())
+        return cls._lookup(filepath)
 
     @classmethod
     def is_supported(cls, filepath: str) -> bool:
         """
         Checks if the file's language is supported for analysis.
         """
-        _, ext = os.path.splitext(filepath)
-        return ext.lower() in cls.EXTENSION_MAP
+        return cls._lookup(filepath) is not None
@@ -17,23 +17,32 @@ class BasePerspective(ABC):
         """Performs the actual analysis on a code entity."""
         pass
 
-    def calculate_score(self, dimensions: List[DimensionScore]) -> float:
+    @staticmethod
+    def calculate_score(dimensions: List[DimensionScore]) -> float:
         """
         Calculates the weighted score based on dimensions.
         """
         if not dimensions:
             return 100.0
-            
-        total_weight = sum(d.weight for d in dimensions)
+
+        # Single pass over the dimensions instead of one sum() per aggregate
+        total_weight = total_weighted = total_score = 0.0
+        count = 0
+        for d in dimensions:
+            total_weight += d.weight
+            total_weighted += d.score * d.weight
+            total_score += d.score
+            count += 1
+
         if total_weight == 0:
-            return sum(d.score for d in dimensions) / len(dimensions)
-            
-        weighted_score = sum(d.score * d.weight for d in dimensions) / total_weight
-        return min(100.0, max(0.0, weighted_score))
+            return total_score / count
+
+        return min(100.0, max(0.0, total_weighted / total_weight))
 
     def _empty_result(self, message: str) -> PerspectiveResult:
         """
         Provides a default empty result for cases where analysis fails or is skipped.
+        The score is fixed at 0, so calculate_score is not involved.
         """
         return PerspectiveResult(
             perspective_name=self.get_name(),
@@ -1,4 +1,6 @@
 import ast
+from itertools import islice
+from typing import Any, Dict, Iterable, List, Tuple
 from ai_collab_analyzer.perspectives.base_perspective import BasePerspective
 from ai_collab_analyzer.models.perspectives import PerspectiveResult, CodeEntity, DimensionScore, Finding, Severity, CodeLocation
 from ai_collab_analyzer.metrics.performance_metrics import PerformanceMetricsCalculator
@@ -7,6 +9,17 @@ class PerformancePerspective(BasePerspective):
     """
     Analyzes code for potential performance issues and resource leaks.
     """
+
+    # Number of findings reported per category
+    MAX_FINDINGS = 3
+
+    # Finding text templates, formatted with % so the constant parts are shared
+    _TITLE_NESTED = "Potential O(n^%d) Complexity"
+    _DESC_NESTED = "Deeply nested %s found at line %d."
+    _TITLE_IO = "Synchronous I/O in Loop: %s"
+    _DESC_IO = "Performing I/O operation '%s' inside a loop at line %d."
+    _TITLE_RESOURCE = "Insecure Resource Handling: %s"
+    _DESC_RESOURCE = "Resource '%s' opened at line %d without a 'with' statement."
     
     def __init__(self):
         self.calculator = PerformanceMetricsCalculator()
@@ -25,30 +38,31 @@ class PerformancePerspective(BasePerspective):
             return self._empty_result("Syntax error prevents performance analysis.")
 
         # 1. Calculate Dimensions
-        nested_loops = self.calculator.detect_nested_loops(tree)
-        recursion = self.calculator.detect_recursion(tree)
-        io_in_loops = self.calculator.analyze_io_in_loops(tree)
-        resource_issues = self.calculator.check_resource_management(tree)
+        # Findings are streamed: only the first few are kept, the rest are just counted
+        loop_count, nested_loops = self._first_findings(self.calculator.iter_nested_loops(tree))
+        recursion_count = sum(1 for _ in self.calculator.iter_recursion(tree))
+        io_count, io_in_loops = self._first_findings(self.calculator.iter_io_in_loops(tree))
+        resource_count, resource_issues = self._first_findings(self.calculator.iter_resource_issues(tree))
 
         # Dimension: Algorithmic Efficiency (0-100)
         # Penalize deep nesting and recursion
-        efficiency_penalty = (len(nested_loops) * 15) + (len(recursion) * 20)
+        efficiency_penalty = (loop_count * 15) + (recursion_count * 20)
         efficiency_score = max(0, 100 - efficiency_penalty)
 
         # Dimension: I/O Efficiency (0-100)
-        io_penalty = len(io_in_loops) * 25
+        io_penalty = io_count * 25
         io_score = max(0, 100 - io_penalty)
 
         # Dimension: Resource Management (0-100)
-        resource_score = max(0, 100 - (len(resource_issues) * 30))
+        resource_score = max(0, 100 - (resource_count * 30))
 
         dimensions = [
             DimensionScore("Algorithmic Efficiency", efficiency_score, weight=0.4, 
-                           details={"nested_loops": len(nested_loops), "recursion": len(recursion)}),
+                           details={"nested_loops": loop_count, "recursion": recursion_count}),
             DimensionScore("I/O Efficiency", io_score, weight=0.3, 
-                           details={"io_in_loops": len(io_in_loops)}),
+                           details={"io_in_loops": io_count}),
             DimensionScore("Resource Management", resource_score, weight=0.3,
-                           details={"resource_leaks": len(resource_issues)})
+                           details={"resource_leaks": resource_count})
         ]
 
         # 2. Identify Findings
@@ -56,30 +70,30 @@ class PerformancePerspective(BasePerspective):
         recommendations = []
 
         # Nested loop findings
-        for loop in nested_loops[:3]:
+        for loop in nested_loops:
             findings.append(Finding(
-                title=f"Potential O(n^{loop['depth']}) Complexity",
-                description=f"Deeply nested {loop['type']} found at line {loop['line_number']}.",
+                title=self._TITLE_NESTED % loop['depth'],
+                description=self._DESC_NESTED % (loop['type'], loop['line_number']),
                 severity=Severity.HIGH if loop['depth'] > 2 else Severity.MEDIUM,
                 location=CodeLocation(code_entity.filepath, loop['line_number'], loop['line_number']),
                 recommendation="Consider optimizing the algorithm or using memoization."
             ))
 
         # I/O findings
-        for io in io_in_loops[:3]:
+        for io in io_in_loops:
             findings.append(Finding(
-                title=f"Synchronous I/O in Loop: {io['operation']}",
-                description=f"Performing I/O operation '{io['operation']}' inside a loop at line {io['line_number']}.",
+                title=self._TITLE_IO % io['operation'],
+                description=self._DESC_IO % (io['operation'], io['line_number']),
                 severity=Severity.HIGH,
                 location=CodeLocation(code_entity.filepath, io['line_number'], io['line_number']),
                 recommendation="Batch I/O operations or use asynchronous processing outside the loop."
             ))
 
         # Resource management findings
-        for issue in resource_issues[:3]:
+        for issue in resource_issues:
             findings.append(Finding(
-                title=f"Insecure Resource Handling: {issue['operation']}",
-                description=f"Resource '{issue['operation']}' opened at line {issue['line_number']} without a 'with' statement.",
+                title=self._TITLE_RESOURCE % issue['operation'],
+                description=self._DESC_RESOURCE % (issue['operation'], issue['line_number']),
                 severity=Severity.MEDIUM,
                 location=CodeLocation(code_entity.filepath, issue['line_number'], issue['line_number']),
                 recommendation=issue['recommendation']
@@ -99,3 +113,10 @@ class PerformancePerspective(BasePerspective):
             recommendations=recommendations
         )
 
+    def _first_findings(self, items: Iterable[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Count a stream of findings while keeping only the first MAX_FINDINGS, in source order.
+        """
+        items = iter(items)
+        first = list(islice(items, self.MAX_FINDINGS))
+        return len(first) + sum(1 for _ in items), first
@@ -1,3 +1,4 @@
+import sys
 from typing import List, Dict, Any
 from ai_collab_analyzer.models.recommendations import ActionableInsight, RecommendationSeverity
 
@@ -15,24 +16,28 @@ class RecommendationEngine:
         prompts = result.get('prompts', [])
         hotspots = result.get('hotspots', [])
         
-        def get_risk(path):
-            rs = result.get('risk_scores', {})
-            if isinstance(rs, dict):
-                return rs.get(path, 0)
-            if isinstance(rs, list):
-                for item in rs:
-                    if isinstance(item, dict):
-                        f = item.get('file') or item.get('filepath')
-                        s = item.get('risk_score') or item.get('score') or item.get('risk')
-                        if f == path: return s or 0
-            return 0
+        # Normalize risk scores to a {path: score} map once instead of scanning per hotspot
+        rs = result.get('risk_scores', {})
+        if isinstance(rs, list):
+            risk_map = {}
+            for item in rs:
+                if isinstance(item, dict):
+                    f = item.get('file') or item.get('filepath')
+                    if f not in risk_map:
+                        risk_map[f] = item.get('risk_score') or item.get('score') or item.get('risk') or 0
+            rs = risk_map
+        elif not isinstance(rs, dict):
+            rs = {}
+        get_risk = rs.get
 
         # 1. High Risk + High Churn
         for hotspot in hotspots:
             if not isinstance(hotspot, dict): continue
             filepath = hotspot.get('filepath')
+            if isinstance(filepath, str):
+                filepath = sys.intern(filepath)
             churn = hotspot.get('churn_rate', 0)
-            file_risk = get_risk(filepath)
+            file_risk = get_risk(filepath, 0)
             
             if file_risk > 50 and churn > 30:
                 insights.append(ActionableInsight(
@@ -61,7 +66,14 @@ class RecommendationEngine:
         if len(prompts) > 0:
             avg_efficiency = result.get('prompt_efficiency', 0) # if we had it
             # Simple heuristic on prompt diversity/lack thereof
-            if len(prompts) > 20 and len(set([p.get('content', '')[:20] for p in prompts])) < 5:
+            # Only "fewer than 5 distinct prefixes" matters, so stop collecting at 5
+            distinct_prefixes = set()
+            if len(prompts) > 20:
+                for p in prompts:
+                    distinct_prefixes.add(p.get('content', '')[:20])
+                    if len(distinct_prefixes) >= 5:
+                        break
+            if len(prompts) > 20 and len(distinct_prefixes) < 5:
                 insights.append(ActionableInsight(
                     title="Fragmented Prompting Pattern",
                     description="Detected repetitive prompts with slight variations, leading to high iteration cycles.",
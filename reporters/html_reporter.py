@@ -1,313 +1,369 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Callable, Tuple
+from jinja2 import Environment, FileSystemBytecodeCache, FileSystemLoader, Template
+from markupsafe import Markup
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
 from .link_generator import LinkGenerator
-from ..analyzers.health_analyzer import HealthAnalyzer
 from ..visualizers.chart_builder import ChartBuilder
 from ..visualizers.network_visualizer import NetworkVisualizer
 from ..core.repository import Repository
+from ..core.disk_cache import prune, touch, write_atomic
 from ..visualizers.radar_chart_builder import RadarChartBuilder
+from ..models.perspectives import Severity
+import bisect
+import hashlib
+import heapq
+import importlib.util
 import json
 import os
+import plotly
+from operator import attrgetter
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "templates")
+BYTECODE_CACHE_DIR = os.path.expanduser("~/.cache/ai_collab_analyzer/jinja")
+SVG_CACHE_DIR = os.path.expanduser("~/.cache/ai_collab_analyzer/svg")
+# Bump when chart building changes; the plotly version is salted in as well
+SVG_CACHE_VERSION = 2
+# Least recently used SVGs beyond this count are deleted
+SVG_CACHE_MAX_FILES = 2000
+
+# Static SVG export needs the optional kaleido package
+HAS_KALEIDO = importlib.util.find_spec("kaleido") is not None
+
+_point_fields = attrgetter('timestamp', 'value')
+_hotspot_fields = attrgetter('filepath', 'change_count', 'churn_rate')
+_HOTSPOT_KEYS = ('filepath', 'change_count', 'churn_rate')
+_by_severity = attrgetter('severity')
+_by_score = attrgetter('score')
+
+# Prompt location link, formatted once per prompt row (arguments are escaped)
+_ANCHOR = Markup('<a href="{}" target="_blank">{}</a>').format
+_SCRIPT_SRC = Markup('<script src="{}"></script>').format
+
+# Score colour bands: a score above bounds[i] and at most bounds[i + 1] gets colors[i + 1]
+_HEALTH_BANDS = ((50, 80), ('red', 'orange', 'green'))
+_QUALITY_BANDS = ((40, 70), ('red', 'orange', 'green'))
+_RISK_BANDS = ((30, 60), ('green', 'orange', 'red'))
+_SEVERITY_COLORS = {Severity.CRITICAL: 'red'}
+
+def _band_color(score: float, bands: Tuple[Tuple[float, ...], Tuple[str, ...]]) -> str:
+    bounds, colors = bands
+    return colors[bisect.bisect_left(bounds, score)]
+
+# How the report loads plotly.js: pinned CDN URL, a bundle copied next to the report, or inlined
+PLOTLY_JS_MODES = ("cdn", "directory", "inline")
+
+# Rows shown in the critical findings and file risk tables
+TOP_K = 10
+
+# Rows rendered up front in the long tables; the rest are revealed page by page
+TABLE_PAGE_SIZE = 50
+
+# Template events grouped per streamed write, and block size for saving rendered HTML
+STREAM_BUFFER_EVENTS = 64
+WRITE_CHUNK_SIZE = 64 * 1024
+
+def _dumps(obj: Any, indent: bool = False) -> str:
+    """JSON-encode obj, using orjson's native encoder when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0).decode()
+    return json.dumps(obj, indent=2 if indent else None)
 
 class HTMLReporter:
     """
     Generates HTML reports from analysis results.
     """
+
+    # Compiled report template, shared by all instances and built once per process
+    _template: Template = None
+
+    # Rendered chart divs keyed by (chart kind, input fingerprint), oldest evicted first
+    DIV_CACHE_SIZE = 64
+    _div_cache: Dict[Tuple[str, tuple], Markup] = {}
     
-    def __init__(self):
+    def __init__(self, static_charts: bool = False):
+        # Render presentational charts as inline SVG instead of plotly divs
+        self.static_charts = static_charts and HAS_KALEIDO
         self.chart_builder = ChartBuilder()
         self.network_visualizer = NetworkVisualizer()
         self.radar_builder = RadarChartBuilder()
+
+    @classmethod
+    def _get_template(cls) -> Template:
+        if cls._template is None:
+            env = Environment(
+                loader=FileSystemLoader(TEMPLATE_DIR),
+                bytecode_cache=cls._bytecode_cache(),
+                autoescape=True,
+                auto_reload=False,
+                cache_size=-1
+            )
+            cls._template = env.get_template("report.html.j2")
+        return cls._template
+
+    @staticmethod
+    def _bytecode_cache():
+        """
+        Persist the compiled template between runs so a fresh process skips
+        Jinja's parser and code generator. Disabled if the cache dir is not writable.
+        """
+        try:
+            os.makedirs(BYTECODE_CACHE_DIR, exist_ok=True)
+        except OSError:
+            return None
+        return FileSystemBytecodeCache(BYTECODE_CACHE_DIR)
+
+    @classmethod
+    def _cached_div(cls, kind: str, key: tuple, build: Callable[[], str]) -> Markup:
+        """
+        Return the chart div for this input, only invoking plotly when the
+        fingerprint has not been rendered before.
+        Plotly output is trusted markup and bypasses autoescaping.
+        """
+        cache_key = (kind, key)
+        div = cls._div_cache.get(cache_key)
+        if div is None:
+            div = Markup(build())
+            if len(cls._div_cache) >= cls.DIV_CACHE_SIZE:
+                cls._div_cache.pop(next(iter(cls._div_cache)))
+            cls._div_cache[cache_key] = div
+        return div
+
+    def _chart_div(self, kind: str, key: tuple, build_figure: Callable[[], Any]) -> Markup:
+        """
+        Render a presentational chart, as inline SVG when static charts are enabled.
+        """
+        if self.static_charts:
+            return self._cached_div("svg:" + kind, key, lambda: self._render_svg(kind, key, build_figure))
+        return self._cached_div(kind, key, lambda: build_figure().to_html(full_html=False, include_plotlyjs=False, validate=False))
+
+    @staticmethod
+    def _render_svg(kind: str, key: tuple, build_figure: Callable[[], Any]) -> str:
+        """
+        Export a figure to SVG through kaleido, reusing an on-disk copy for the
+        same input fingerprint so regeneration across runs skips the export.
+        """
+        fingerprint = repr((SVG_CACHE_VERSION, plotly.__version__, kind, key))
+        digest = hashlib.sha256(fingerprint.encode("utf-8")).hexdigest()
+        svg_path = os.path.join(SVG_CACHE_DIR, f"{digest}.svg")
+        try:
+            with open(svg_path, "r", encoding="utf-8") as f:
+                svg = f.read()
+            touch(svg_path)
+        except OSError:
+            svg = build_figure().to_image(format="svg", engine="kaleido").decode("utf-8")
+            try:
+                write_atomic(svg_path, svg.encode("utf-8"))
+                prune(SVG_CACHE_DIR, SVG_CACHE_MAX_FILES)
+            except OSError:
+                pass
+        return f"<div>{svg}</div>"
         
-    def generate_report(self, repository: Repository, analysis_result: Dict[str, Any]):
+    def generate_report(self, repository: Repository, analysis_result: Dict[str, Any], plotly_js: str = "cdn"):
         """
         Generate HTML content for the report.
+        plotly_js is "cdn" or "inline"; "directory" needs an output path, see write_report.
+        """
+        if plotly_js == "directory":
+            raise ValueError("plotly_js='directory' requires write_report with an output path")
+        context = self._build_context(repository, analysis_result)
+        context["plotly_script"] = self._plotly_script(plotly_js)
+        return self._get_template().render(context)
+
+    def write_report(self, repository: Repository, analysis_result: Dict[str, Any], output_path: str, plotly_js: str = "directory"):
+        """
+        Render the report straight into a file.
+        Template chunks are encoded and streamed to disk as they are produced,
+        so the full HTML document is never held in memory as a single string.
         """
-        health_score = analysis_result.get("health_score", 0)
-        hotspots = analysis_result.get("hotspots", [])
+        context = self._build_context(repository, analysis_result)
+        context["plotly_script"] = self._plotly_script(plotly_js, os.path.dirname(os.path.abspath(output_path)))
+        stream = self._get_template().stream(context)
+        stream.enable_buffering(STREAM_BUFFER_EVENTS)
+        stream.dump(output_path, encoding="utf-8")
+
+    @staticmethod
+    def _plotly_script(mode: str, output_dir: str = None) -> Markup:
+        """
+        Build the <script> tag that loads plotly.js, pinned to the version the
+        figures were generated with.
+        """
+        if mode not in PLOTLY_JS_MODES:
+            raise ValueError(f"Unknown plotly_js mode: {mode}")
+            
+        version = get_plotlyjs_version()
+        if mode == "inline":
+            # Fully self-contained report (~4.5MB larger)
+            return Markup('<script type="text/javascript">') + Markup(get_plotlyjs()) + Markup('</script>')
+            
+        if mode == "directory":
+            # Versioned file name, so browsers cache it and upgrades never reuse a stale copy
+            filename = f"plotly-{version}.min.js"
+            bundle_path = os.path.join(output_dir, filename)
+            if not os.path.exists(bundle_path):
+                # Atomic, so a concurrent report never serves a half-written bundle
+                write_atomic(bundle_path, get_plotlyjs().encode("utf-8"))
+            return _SCRIPT_SRC(filename)
+            
+        return _SCRIPT_SRC(f"https://cdn.plot.ly/plotly-{version}.min.js")
+
+    def _build_context(self, repository: Repository, analysis_result: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Collect the flat set of values consumed by the report template.
+        """
+        # Bind the lookup once; every key below is read exactly once
+        get = analysis_result.get
+        health_score = get("health_score", 0)
+        hotspots = get("hotspots", [])
         
         # Initialize LinkGenerator
         link_gen = LinkGenerator(repository.remote_url)
-        summary = analysis_result.get("summary", "")
+        summary = get("summary", "")
         
-        # Create charts
-        hotspot_chart = self.chart_builder.create_hotspot_chart(hotspots)
-        hotspot_div = hotspot_chart.to_html(full_html=False, include_plotlyjs=False) if hotspot_chart else "<div>No data</div>"
+        # Create charts (cached on a fingerprint of exactly the fields each chart reads)
+        hotspot_div = self._chart_div(
+            "hotspots",
+            tuple(map(_hotspot_fields, hotspots)),
+            lambda: self.chart_builder.create_hotspot_chart(hotspots)
+        )
         
-        coupling_chart = self.network_visualizer.create_coupling_chart(analysis_result)
-        coupling_div = coupling_chart.to_html(full_html=False, include_plotlyjs=False) if coupling_chart else "<div>No coupling data</div>"
+        coupling_div = self._chart_div(
+            "coupling",
+            tuple((e["source"], e["target"], e["weight"]) for e in get("coupling_edges", [])),
+            lambda: self.network_visualizer.create_coupling_chart(analysis_result)
+        )
+
+        # The timeline keeps its hover details, so it is always interactive
+
+        timeline_div = self._cached_div(
+            "timeline",
+            (
+                tuple((b.start_commit.date, b.duration) for b in get("bursts", [])),
+                tuple((r.filepath, tuple((c.date, c.total_changes, c.message) for c in r.commits)) for r in get("regenerations", []))
+            ),
+            lambda: self.chart_builder.create_pattern_timeline(analysis_result).to_html(full_html=False, include_plotlyjs=False, validate=False)
+        )
+
+        perspective_scores = get('perspective_scores', {})
+        if self.static_charts and perspective_scores:
+            radar_div = self._chart_div(
+                "radar",
+                tuple(perspective_scores.items()),
+                lambda: self.radar_builder.create_perspective_figure(perspective_scores)
+            )
+        else:
+            radar_div = self._cached_div(
+                "radar",
+                tuple(perspective_scores.items()),
+                lambda: self.radar_builder.create_perspective_radar(perspective_scores)
+            )
+
+        learning_curve = get('learning_curve')
+        forecasts = get('forecasts')
+        hist_x, hist_y = self._serialize_series(forecasts[0].historical_data if forecasts else ())
+        fore_x, fore_y = self._serialize_series(forecasts[0].forecasted_data if forecasts else ())
         
-        html = f"""
-        <!DOCTYPE html>
-        <html>
-        <head>
-            <title>AI Collaboration Analysis Report</title>
-            <script src="https://cdn.plot.ly/plotly-latest.min.js"></script>
-            <style>
-                body {{ font-family: sans-serif; margin: 20px; }}
-                h1 {{ color: #333; }}
-                .score {{ font-size: 2em; font-weight: bold; color: {'green' if health_score > 80 else 'orange' if health_score > 50 else 'red'}; }}
-                .section {{ margin-bottom: 30px; border: 1px solid #ddd; padding: 20px; border-radius: 5px; }}
-            </style>
-        </head>
-        <body>
-            <h1>Repository Health Report</h1>
-            
-            <div class="section">
-                <h2>Summary</h2>
-                <p>{summary}</p>
-                <div class="score">Health Score: {health_score:.2f}</div>
-            </div>
-
-            <div class="section">
-                <h2>Code Quality Perspectives</h2>
-                <div class="stats-grid">
-                    <div class="stat-card">
-                        <h3>Composite Quality</h3>
-                        <div class="score" style="color: {'green' if analysis_result.get('composite_quality_score', 0) > 70 else 'orange' if analysis_result.get('composite_quality_score', 0) > 40 else 'red'}">
-                            {analysis_result.get('composite_quality_score', 0):.1f}
-                        </div>
-                    </div>
-                </div>
-                
-                <div style="display: flex; flex-wrap: wrap;">
-                    <div style="flex: 1; min-width: 400px;">
-                        {self.radar_builder.create_perspective_radar(analysis_result.get('perspective_scores', {}))}
-                    </div>
-                    <div style="flex: 1; min-width: 400px;">
-                        <h3>Critical Quality Findings</h3>
-                        <table>
-                            <tr>
-                                <th>Finding</th>
-                                <th>Severity</th>
-                                <th>Location</th>
-                            </tr>
-                            {
-                                "".join([
-                                    f'<tr><td>{f.title}</td><td style="color: {"red" if f.severity.value == "critical" else "orange"}; font-weight: bold;">{f.severity.value.upper()}</td><td>{f.location.filepath if f.location else "Global"}</td></tr>'
-                                    for f in analysis_result.get('critical_findings', [])[:10]
-                                ]) or "<tr><td colspan='3'>No critical quality issues found.</td></tr>"
-                            }
-                        </table>
-                    </div>
-                </div>
-
-                {
-                    "".join([
-                        f"""
-                        <div style="margin-top: 20px; padding: 15px; background: #f9f9f9; border-left: 5px solid #007bff;">
-                            <h3>{p.perspective_name} Details ({p.score:.1f}%)</h3>
-                            <div style="display: flex; gap: 20px;">
-                                <div style="flex: 1;">
-                                    <h4>Dimension Scores</h4>
-                                    <ul>
-                                        {"".join([f"<li><strong>{d.name}:</strong> {d.score:.1f}%</li>" for d in p.dimensions])}
-                                    </ul>
-                                </div>
-                                <div style="flex: 2;">
-                                    <h4>Key Recommendations</h4>
-                                    <ul>
-                                        {"".join([f"<li>{rec}</li>" for rec in p.recommendations[:5]]) or "<li>Maintain current practices.</li>"}
-                                    </ul>
-                                </div>
-                            </div>
-                        </div>
-                        """
-                        for p in analysis_result.get('perspective_details', [])
-                        if p.score < 100
-                    ])
-                }
-            </div>
-            
-            <div class="section">
-                <h2>Collaboration Patterns</h2>
-                <p><strong>Burst Patterns Detected:</strong> {analysis_result.get('burst_patterns_count', 0)}</p>
-                <p><strong>Regenerations Suspected:</strong> {analysis_result.get('regeneration_cycles_count', 0)}</p>
-                
-                <h3>Timeline</h3>
-                {self.chart_builder.create_pattern_timeline(analysis_result).to_html(full_html=False, include_plotlyjs=False)}
-            </div>
-            
-            <div class="section">
-                <h2>Prompt Engineering Evolution</h2>
-                <div class="stats-grid">
-                    <div class="stat-card">
-                        <h3>Total Prompts Detected</h3>
-                        <p>{analysis_result.get('total_prompts', 0)}</p>
-                    </div>
-                    <div class="stat-card">
-                        <h3>Prompts per Commit</h3>
-                        <p>{analysis_result.get('prompt_frequency_per_commit', 0):.2f}</p>
-                    </div>
-                    <div class="stat-card">
-                        <h3>Avg Sentiment</h3>
-                        <p>{analysis_result.get('sentiment_avg', 0):.2f}</p>
-                    </div>
-                    <div class="stat-card">
-                        <h3>Prompt Efficiency</h3>
-                        <p>{analysis_result.get('efficiency_score', 0):.1f}%</p>
-                    </div>
-                    <div class="stat-card">
-                        <h3>AI Skill Level</h3>
-                        <p>{analysis_result.get('learning_curve').skill_level if analysis_result.get('learning_curve') else 'Unknown'}</p>
-                    </div>
-                    <div class="stat-card">
-                        <h3>Growth Trend</h3>
-                        <p>{"+" if (analysis_result.get('learning_curve').improvement_rate if analysis_result.get('learning_curve') else 0) > 0 else ""}{analysis_result.get('learning_curve').improvement_rate if analysis_result.get('learning_curve') else 0:.1f}%</p>
-                    </div>
-                </div>
-                
-                <p><strong>Top Themes:</strong> {", ".join(analysis_result.get('top_topics', [])) or "None detected"}</p>
-                
-                <h3>Detected Prompts</h3>
-                <table>
-                    <tr>
-                        <th>Source</th>
-                        <th>Location</th>
-                        <th>Content</th>
-                    </tr>
-                    {
-                        "".join([
-                            f"<tr><td>{p.source_type}</td><td>{self._linkify_location(p, link_gen)}</td><td>{p.content}</td></tr>"
-                            for p in analysis_result.get('prompts', [])
-                        ]) or "<tr><td colspan='3'>No prompts detected</td></tr>"
-                    }
-                </table>
-            </div>
-
-            <div class="section">
-                <h2>AI Instruction Impact</h2>
-                <p>Measures how changes to requirements or instructions in documentation correlate with code stability.</p>
-                <table>
-                    <tr>
-                        <th>Instruction Change</th>
-                        <th>Commit</th>
-                        <th>Metric Impact</th>
-                    </tr>
-                    {
-                        "".join([
-                            f'<tr><td><code>{c.instruction[:80]}...</code></td><td>{c.commit_hash}</td><td style="color: {"#28a745" if c.impact_score > 0 else "#dc3545"}; font-weight: bold;">{c.context}</td></tr>'
-                            for c in analysis_result.get('instructional_correlations', [])
-                        ]) or "<tr><td colspan='3'>No significant instructional correlations detected yet.</td></tr>"
-                    }
-                </table>
-            </div>
-            
-            <div class="section">
-                <h2>Temporal Coupling Graph</h2>
-                {coupling_div}
-                <p>Displays files that frequently change together in the same commit.</p>
-            </div>
-
-            <div class="section">
-                <h2>Code Coherence</h2>
-                <div class="score">Coherence Score: {analysis_result.get('coherence_score', 0):.2f}</div>
-                <p>Measures architectural consistency and code reuse. Higher is better.</p>
-                
-                <h3>Duplication Clusters</h3>
-                <table>
-                    <tr>
-                        <th>Cluster ID</th>
-                        <th>Files Affected</th>
-                        <th>Similarity</th>
-                        <th>Snippet</th>
-                    </tr>
-                    {
-                        "".join([
-                            f"<tr><td>{c.cluster_id}</td><td>{', '.join(c.files)}</td><td>{c.similarity_score:.1f}%</td><td><code>{c.code_snippet}</code></td></tr>"
-                            for c in analysis_result.get('duplication_clusters', [])
-                        ]) or "<tr><td colspan='4'>No significant duplication detected.</td></tr>"
-                    }
-                </table>
-            </div>
-            
-            <div class="section">
-                <h2>Future Risks & Predictions</h2>
-                <div class="score" style="color: {'red' if (analysis_result.get('overall_risk_score', 0)) > 60 else 'orange' if (analysis_result.get('overall_risk_score', 0)) > 30 else 'green'}">
-                    Risk Score: {analysis_result.get('overall_risk_score', 0):.2f}
-                </div>
-                
-                {
-                    "".join([
-                        f'<div style="background: #fff3f3; border-left: 5px solid red; padding: 10px; margin: 10px 0;"><strong>{w.severity}: {w.title}</strong><br>{w.message}</div>'
-                        for w in analysis_result.get('warnings', [])
-                    ])
-                }
-
-                <h3>File Risk Map</h3>
-                <table>
-                    <tr>
-                        <th>File</th>
-                        <th>Risk Score</th>
-                        <th>Trend</th>
-                        <th>Factors</th>
-                    </tr>
-                    {
-                        "".join([
-                            f"<tr><td>{r.filepath}</td><td>{r.score:.1f}%</td><td>{r.trend}</td><td>{', '.join([f.name for f in r.factors])}</td></tr>"
-                            for r in analysis_result.get('risk_scores', [])[:10]
-                        ])
-                    }
-                </table>
-
-                <h3>Activity Forecast</h3>
-                <p>Projected cumulative churn (additions + deletions) based on current velocity.</p>
-                <div id="forecast_chart"></div>
-                <script>
-                    var hist_x = {json.dumps([p.timestamp.strftime('%Y-%m-%d') for p in (analysis_result.get('forecasts')[0].historical_data if analysis_result.get('forecasts') else [])])};
-                    var hist_y = {json.dumps([p.value for p in (analysis_result.get('forecasts')[0].historical_data if analysis_result.get('forecasts') else [])])};
-                    var fore_x = {json.dumps([p.timestamp.strftime('%Y-%m-%d') for p in (analysis_result.get('forecasts')[0].forecasted_data if analysis_result.get('forecasts') else [])])};
-                    var fore_y = {json.dumps([p.value for p in (analysis_result.get('forecasts')[0].forecasted_data if analysis_result.get('forecasts') else [])])};
-                    
-                    var trace1 = {{ x: hist_x, y: hist_y, mode: 'lines', name: 'Historical' }};
-                    var trace2 = {{ x: fore_x, y: fore_y, mode: 'lines', name: 'Forecasted', line: {{ dash: 'dot', color: 'red' }} }};
-                    Plotly.newPlot('forecast_chart', [trace1, trace2], {{ title: 'Cumulative Churn Forecast' }});
-                </script>
-            </div>
-
-            <div class="section">
-                <h2>Hotspots</h2>
-                {hotspot_div}
-            </div>
-            
-            <div class="section">
-                <h2>Raw Data</h2>
-                <pre>{json.dumps(self._serialize_hotspots(hotspots), indent=2)}</pre>
-            </div>
-        </body>
-        </html>
-        """
-        return html
+        composite_quality_score = get('composite_quality_score', 0)
+        overall_risk_score = get('overall_risk_score', 0)
+        
+        context = {
+            "summary": summary,
+            "health_score": health_score,
+            "health_color": _band_color(health_score, _HEALTH_BANDS),
+            "composite_quality_score": composite_quality_score,
+            "quality_color": _band_color(composite_quality_score, _QUALITY_BANDS),
+            "severity_colors": _SEVERITY_COLORS,
+            "radar_div": radar_div,
+            "critical_findings": heapq.nlargest(TOP_K, get('critical_findings', []), key=_by_severity),
+            "perspective_details": get('perspective_details', []),
+            "burst_patterns_count": get('burst_patterns_count', 0),
+            "regeneration_cycles_count": get('regeneration_cycles_count', 0),
+            "timeline_div": timeline_div,
+            "total_prompts": get('total_prompts', 0),
+            "prompt_frequency_per_commit": get('prompt_frequency_per_commit', 0),
+            "sentiment_avg": get('sentiment_avg', 0),
+            "efficiency_score": get('efficiency_score', 0),
+            "skill_level": learning_curve.skill_level if learning_curve else 'Unknown',
+            "improvement_rate": learning_curve.improvement_rate if learning_curve else 0,
+            "top_topics": get('top_topics', []),
+            "prompts": get('prompts', []),
+            "page_size": TABLE_PAGE_SIZE,
+            "linkify": self._linkify_location,
+            "link_gen": link_gen,
+            "instructional_correlations": get('instructional_correlations', []),
+            "coupling_div": coupling_div,
+            "coherence_score": get('coherence_score', 0),
+            "duplication_clusters": get('duplication_clusters', []),
+            "overall_risk_score": overall_risk_score,
+            "risk_color": _band_color(overall_risk_score, _RISK_BANDS),
+            "warnings": get('warnings', []),
+            "risk_scores": heapq.nlargest(TOP_K, get('risk_scores', []), key=_by_score),
+            "hist_x": hist_x,
+            "hist_y": hist_y,
+            "fore_x": fore_x,
+            "fore_y": fore_y,
+            "hotspot_div": hotspot_div,
+            # The pretty-printed dump is the costliest part of the report and is opt-in
+            "raw_data": _dumps(self._serialize_hotspots(hotspots), indent=True) if get('include_raw_data', False) else None,
+        }
+        return context
         
     def save_report(self, html: str, output_path: str):
         """
         Save the report to a file.
         """
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(html)
+        # Encode once and hand the OS page-sized blocks from a binary handle
+        data = memoryview(html.encode("utf-8"))
+        with open(output_path, "wb") as f:
+            for offset in range(0, len(data), WRITE_CHUNK_SIZE):
+                f.write(data[offset:offset + WRITE_CHUNK_SIZE])
             
-    def _linkify_location(self, prompt, link_gen):
+    @staticmethod
+    def _location(prompt) -> str:
         location = prompt.filepath if prompt.filepath else ""
         if prompt.line_number:
             location += f" : {prompt.line_number}"
-            
-        if prompt.source_type == "commit_message" and prompt.filepath: # We stored hash in filepath for commits
+        return location
+
+    @staticmethod
+    def _commit_link(prompt, link_gen):
+        if prompt.filepath: # We stored hash in filepath for commits
             link = link_gen.generate_commit_link(prompt.filepath)
             if link:
-                return f'<a href="{link}" target="_blank">{prompt.filepath}</a>'
-        elif prompt.filepath:
+                return _ANCHOR(link, prompt.filepath)
+        return HTMLReporter._location(prompt)
+
+    @staticmethod
+    def _file_link(prompt, link_gen):
+        location = HTMLReporter._location(prompt)
+        if prompt.filepath:
             link = link_gen.generate_file_link(prompt.filepath)
             if link:
-                return f'<a href="{link}" target="_blank">{location}</a>'
-                
+                return _ANCHOR(link, location)
         return location
 
+    # Link builder per prompt source type; anything else links to the file
+    _LINK_HANDLERS = {
+        "commit_message": _commit_link,
+    }
+
+    def _linkify_location(self, prompt, link_gen):
+        return self._LINK_HANDLERS.get(prompt.source_type, HTMLReporter._file_link)(prompt, link_gen)
+
+    @staticmethod
+    def _serialize_series(points) -> Tuple[Markup, Markup]:
+        """Split trend points into JSON-encoded date and value arrays in one pass"""
+        xs, ys = [], []
+        for timestamp, value in map(_point_fields, points):
+            xs.append(timestamp.strftime('%Y-%m-%d'))
+            ys.append(value)
+        # Dates and numbers only, so the JSON is safe to embed in the script block as-is
+        return Markup(_dumps(xs)), Markup(_dumps(ys))
+
     def _serialize_hotspots(self, hotspots: List[Any]) -> List[Dict]:
         """Convert objects to dicts for JSON"""
-        return [
-            {
-                "filepath": h.filepath,
-                "change_count": h.change_count,
-                "churn_rate": h.churn_rate
-            }
-            for h in hotspots
-        ]
+        return [dict(zip(_HOTSPOT_KEYS, row)) for row in map(_hotspot_fields, hotspots)]
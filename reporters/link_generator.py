@@ -1,4 +1,27 @@
-from typing import Optional
+import re
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+_SSH_REMOTE = re.compile(r"git@([^:]+):(.+?)(?:\.git)?\Z")
+_GIT_SUFFIX = re.compile(r"\.git\Z")
+
+@lru_cache(maxsize=64)
+def _parse_base_url(remote_url: Optional[str]) -> Optional[str]:
+    """
+    Turn a git remote into a browsable base URL.
+    Cached at module level so every LinkGenerator built for the same remote
+    in a batch run shares the parsed result.
+    """
+    if not remote_url:
+        return None
+        
+    # Handle SSH style (git@github.com:user/repo.git) in one match
+    m = _SSH_REMOTE.match(remote_url)
+    if m:
+        return f"https://{m[1]}/{m[2]}"
+        
+    # Remove .git suffix
+    return _GIT_SUFFIX.sub("", remote_url)
 
 class LinkGenerator:
     """
@@ -9,22 +32,12 @@ class LinkGenerator:
     def __init__(self, remote_url: Optional[str]):
         self.remote_url = remote_url
         self.base_url = self._parse_base_url(remote_url)
+        # Generated links, reused for prompts pointing at the same commit or file
+        self._commit_links: Dict[str, str] = {}
+        self._file_links: Dict[Tuple[str, str], str] = {}
         
     def _parse_base_url(self, remote_url: Optional[str]) -> Optional[str]:
-        if not remote_url:
-            return None
-            
-        # Handle SSH style: git@github.com:user/repo.git
-        if remote_url.startswith("git@"):
-            url = remote_url.replace(":", "/").replace("git@", "https://")
-        else:
-            url = remote_url
-            
-        # Remove .git suffix
-        if url.endswith(".git"):
-            url = url[:-4]
-            
-        return url
+        return _parse_base_url(remote_url)
 
     def generate_commit_link(self, commit_hash: str) -> Optional[str]:
         """
@@ -33,8 +46,11 @@ class LinkGenerator:
         if not self.base_url:
             return None
             
-        # GitHub/GitLab implementation
-        return f"{self.base_url}/commit/{commit_hash}"
+        link = self._commit_links.get(commit_hash)
+        if link is None:
+            # GitHub/GitLab implementation
+            link = self._commit_links[commit_hash] = f"{self.base_url}/commit/{commit_hash}"
+        return link
         
     def generate_file_link(self, filepath: str, commit_hash: str = "master") -> Optional[str]:
         """
@@ -43,5 +59,9 @@ class LinkGenerator:
         if not self.base_url:
             return None
             
-        # GitHub/GitLab use 'blob' for files
-        return f"{self.base_url}/blob/{commit_hash}/{filepath}"
+        key = (filepath, commit_hash)
+        link = self._file_links.get(key)
+        if link is None:
+            # GitHub/GitLab use 'blob' for files
+            link = self._file_links[key] = f"{self.base_url}/blob/{commit_hash}/{filepath}"
+        return link
@@ -1,5 +1,37 @@
-from typing import List, Tuple, Dict, Any, Optional
-from rapidfuzz import fuzz
+from typing import List, Tuple, Dict, Any, Optional, Set
+from functools import lru_cache
+import bisect
+import re
+import numpy as np
+from rapidfuzz.distance import Indel
+from rapidfuzz.process import cdist
+
+try:
+    from datasketch import MinHash, MinHashLSH
+except ImportError:
+    MinHash = MinHashLSH = None
+
+# Rows of the similarity matrix scored per cdist call; bounds memory to BAND x n scores
+CDIST_BAND_SIZE = 512
+
+# Above this many blocks, candidates come from MinHash LSH instead of exhaustive scoring
+LSH_MIN_BLOCKS = 500
+SHINGLE_SIZE = 5
+MINHASH_PERMUTATIONS = 128
+# Bounds on the LSH Jaccard threshold; below the floor LSH recall collapses and scoring stays exhaustive
+LSH_MIN_JACCARD = 0.1
+LSH_MAX_JACCARD = 0.4
+
+# Triple-quoted strings (docstrings/multi-line strings) and single-line comments
+_TRIPLE_QUOTED = re.compile(r'(""".*?"""|\'\'\'.*?\'\'\')', re.DOTALL)
+_LINE_COMMENT = re.compile(r'#.*')
+
+@lru_cache(maxsize=4096)
+def _normalize_code(code: str) -> str:
+    code = _TRIPLE_QUOTED.sub('', code)
+    code = _LINE_COMMENT.sub('', code)
+    # Remove all whitespace and newlines for a structural comparison
+    return "".join(code.split())
 
 class SimilarityGroup:
     """Represents a group of similar code elements."""
@@ -19,18 +51,14 @@ class CodeSimilarityAnalyzer:
     def normalize_code(self, code: str) -> str:
         """
         Normalizes code by removing comments, docstrings, and extra whitespace.
+        Results are memoized on the code string.
         """
-        import re
-        # Remove triple-quoted strings (docstrings/multi-line strings)
-        code = re.sub(r'(""".*?"""|\'\'\'.*?\'\'\')', '', code, flags=re.DOTALL)
-        # Remove single-line comments
-        code = re.sub(r'#.*', '', code)
-        # Remove all whitespace and newlines for a structural comparison
-        return "".join(code.split())
+        return _normalize_code(code)
 
-    def calculate_similarity(self, code1: str, code2: str) -> float:
+    def calculate_similarity(self, code1: str, code2: str, score_cutoff: float = 0.0) -> float:
         """
-        Calculates fuzzy similarity between two code blocks after normalization.
+        Calculates fuzzy similarity (0-100) between two code blocks after normalization.
+        Scores below score_cutoff are returned as 0, letting the scorer stop early.
         """
         if not code1 or not code2:
             return 0.0
@@ -45,7 +73,8 @@ class CodeSimilarityAnalyzer:
         if not norm1 or not norm2:
             return 0.0
             
-        return fuzz.ratio(norm1, norm2)
+        # Same value as fuzz.ratio without its processor/wrapper layers
+        return Indel.normalized_similarity(norm1, norm2, score_cutoff=score_cutoff / 100) * 100
 
     def find_near_duplicates(self, blocks: List[Tuple[str, str]], threshold: Optional[float] = None) -> List[Tuple[str, str, float]]:
         """
@@ -56,15 +85,101 @@ class CodeSimilarityAnalyzer:
         t = threshold if threshold is not None else self.threshold
         results = []
         
-        for i in range(len(blocks)):
-            for j in range(i + 1, len(blocks)):
-                id1, code1 = blocks[i]
-                id2, code2 = blocks[j]
-                if id1 == id2:
-                    continue
+        # Normalize every block once; short or empty blocks can never match
+        ids, norms = [], []
+        for block_id, code in blocks:
+            if not code or len(code) < self.min_length:
+                continue
+            norm = self.normalize_code(code)
+            if norm:
+                ids.append(block_id)
+                norms.append(norm)
                 
-                score = self.calculate_similarity(code1, code2)
-                if score >= t:
-                    results.append((id1, id2, score))
+        jaccard = self._lsh_threshold(t)
+        if len(norms) >= LSH_MIN_BLOCKS and MinHashLSH is not None and jaccard >= LSH_MIN_JACCARD:
+            candidates = self._lsh_candidate_pairs(norms, jaccard)
+        else:
+            candidates = self._cdist_pairs(norms, t)
+                    
+        cutoff = t / 100
+        # Report pairs in the same (i, j) order as a pairwise scan over the input
+        for i, j in sorted(candidates):
+            if ids[i] == ids[j]:
+                continue
+            # Exact score for each candidate (cdist hits were only checked in float32)
+            score = Indel.normalized_similarity(norms[i], norms[j], score_cutoff=cutoff) * 100
+            if score >= t:
+                results.append((ids[i], ids[j], score))
         
         return results
+
+    def _cdist_pairs(self, norms: List[str], t: float) -> List[Tuple[int, int]]:
+        """
+        Exhaustively find index pairs (i < j) scoring at least t.
+        """
+        # ratio = 200 * matches / (len1 + len2) and matches <= the shorter length, so a
+        # pair can only reach t when longer <= shorter * (200 - t) / t
+        max_growth = (200.0 - t) / t if t > 0 else float("inf")
+        
+        # Walk blocks in length order so each band only meets the columns it could match
+        order = sorted(range(len(norms)), key=lambda k: len(norms[k]))
+        sorted_norms = [norms[k] for k in order]
+        lengths = [len(s) for s in sorted_norms]
+        
+        # Normalized scores are in [0, 1]; compare in float32 like the score matrix so
+        # rounding cannot drop a pair that sits exactly on the threshold
+        cutoff = t / 100
+        min_score = np.float32(cutoff)
+        
+        hits = []
+        for start in range(0, len(sorted_norms), CDIST_BAND_SIZE):
+            stop = min(start + CDIST_BAND_SIZE, len(sorted_norms))
+            end = bisect.bisect_right(lengths, lengths[stop - 1] * max_growth)
+            # Score the band against itself and longer blocks in C across all cores.
+            # Pairs below the threshold come back as 0 thanks to score_cutoff.
+            scores = cdist(sorted_norms[start:stop], sorted_norms[start:end], scorer=Indel.normalized_similarity,
+                           score_cutoff=cutoff, dtype=np.float32, workers=-1)
+            rows, cols = np.nonzero(scores >= min_score)
+            for r, c in zip((rows + start).tolist(), (cols + start).tolist()):
+                if c > r:
+                    i, j = order[r], order[c]
+                    hits.append((i, j) if i < j else (j, i))
+        return hits
+
+    @staticmethod
+    def _lsh_threshold(t: float) -> float:
+        """
+        Shingle Jaccard threshold for a ratio threshold t.
+        Each edit destroys up to SHINGLE_SIZE shingles, so shingle Jaccard sits well
+        below the Indel ratio; the threshold is lowered accordingly and capped so
+        that high ratio thresholds keep full recall.
+        """
+        return min(LSH_MAX_JACCARD, 1.0 - (1.0 - t / 100.0) * (SHINGLE_SIZE + 1))
+
+    def _lsh_candidate_pairs(self, norms: List[str], jaccard: float) -> Set[Tuple[int, int]]:
+        """
+        Find index pairs (i < j) whose shingle sets collide in at least one MinHash LSH band.
+        Sub-quadratic but approximate: pairs far below the Jaccard threshold can be missed.
+        """
+        signatures = MinHash.bulk(
+            [[s.encode("utf-8") for s in self._shingle(n)] for n in norms],
+            num_perm=MINHASH_PERMUTATIONS
+        )
+        
+        lsh = MinHashLSH(threshold=jaccard, num_perm=MINHASH_PERMUTATIONS)
+        for idx, signature in enumerate(signatures):
+            lsh.insert(idx, signature)
+            
+        candidates = set()
+        for idx, signature in enumerate(signatures):
+            for other in lsh.query(signature):
+                if other != idx:
+                    candidates.add((idx, other) if idx < other else (other, idx))
+        return candidates
+
+    @staticmethod
+    def _shingle(code: str, k: int = SHINGLE_SIZE) -> Set[str]:
+        """
+        Character k-grams of normalized code.
+        """
+        return {code[i:i + k] for i in range(max(1, len(code) - k + 1))}
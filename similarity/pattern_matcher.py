@@ -1,63 +1,170 @@
 import ast
-from typing import List, Dict, Any
+import atexit
+import hashlib
+import os
+import pickle
+from collections import OrderedDict
+from typing import List, Dict, Any, Optional
+from ai_collab_analyzer.core.disk_cache import write_atomic
+from ai_collab_analyzer.parsers.ast_visitor import DispatchVisitor
+
+TRAITS_CACHE_PATH = os.path.expanduser("~/.cache/ai_collab_analyzer/traits.pkl")
+# Bump when trait extraction changes; a cache written by another version is discarded
+TRAITS_VERSION = 2
+# Least recently used traits beyond this many sources are evicted
+TRAITS_CACHE_MAX_ENTRIES = 50000
+
+class _TraitVisitor(DispatchVisitor):
+    """Counts structural traits in a single pass over the tree."""
+
+    def __init__(self):
+        self.traits = {
+            "has_list_comp": 0,
+            "has_for_loop": 0,
+            "has_try_except": 0,
+            "has_nested_functions": 0,
+            "async_count": 0,
+            "docstring_present": False
+        }
+
+    def generic_visit(self, node):
+        for child in ast.iter_child_nodes(node):
+            self.visit(child)
+
+    def _skip(self, node):
+        pass
+
+    # Subtrees that cannot contain a list comprehension, loop, try or function:
+    # leaf expressions, expression contexts, operators and simple statements
+    visit_Name = visit_Constant = visit_alias = _skip
+    visit_Load = visit_Store = visit_Del = _skip
+    visit_Add = visit_Sub = visit_Mult = visit_MatMult = visit_Div = visit_Mod = visit_Pow = _skip
+    visit_LShift = visit_RShift = visit_BitOr = visit_BitXor = visit_BitAnd = visit_FloorDiv = _skip
+    visit_And = visit_Or = visit_Invert = visit_Not = visit_UAdd = visit_USub = _skip
+    visit_Eq = visit_NotEq = visit_Lt = visit_LtE = visit_Gt = visit_GtE = _skip
+    visit_Is = visit_IsNot = visit_In = visit_NotIn = _skip
+    visit_Pass = visit_Break = visit_Continue = visit_Import = visit_ImportFrom = _skip
+    visit_Global = visit_Nonlocal = _skip
+
+    def visit_ListComp(self, node):
+        self.traits["has_list_comp"] += 1
+        self.generic_visit(node)
+
+    def visit_For(self, node):
+        self.traits["has_for_loop"] += 1
+        self.generic_visit(node)
+
+    def visit_Try(self, node):
+        self.traits["has_try_except"] += 1
+        self.generic_visit(node)
+
+    def visit_FunctionDef(self, node):
+        # Check for nested functions
+        for child in node.body:
+            if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                self.traits["has_nested_functions"] += 1
+
+        # Check for docstring
+        if ast.get_docstring(node):
+            self.traits["docstring_present"] = True
+        self.generic_visit(node)
+
+    def visit_AsyncFunctionDef(self, node):
+        self.traits["async_count"] += 1
+        self.visit_FunctionDef(node)
 
 class PatternMatcher:
     """
     Identifies structural patterns in Python code.
     """
-    
+
+    # Traits keyed by a digest of the source in LRU order, shared by all matchers in the process
+    _traits_cache: Optional["OrderedDict[bytes, Dict[str, Any]]"] = None
+    _cache_dirty = False
+
+    @staticmethod
+    def _read_cache_file() -> Dict[bytes, Dict[str, Any]]:
+        # Traits persisted by a run of the same extractor version, else nothing
+        try:
+            with open(TRAITS_CACHE_PATH, "rb") as f:
+                stored = pickle.load(f)
+        except (OSError, pickle.UnpicklingError, EOFError):
+            return {}
+        if not isinstance(stored, dict) or stored.get("version") != TRAITS_VERSION:
+            return {}
+        return stored.get("traits", {})
+
+    @classmethod
+    def _load_cache(cls) -> "OrderedDict[bytes, Dict[str, Any]]":
+        """
+        Load the traits persisted by earlier runs so unchanged code is never
+        re-parsed, and schedule the cache to be written back on exit.
+        """
+        if cls._traits_cache is None:
+            cls._traits_cache = OrderedDict(cls._read_cache_file())
+            atexit.register(cls.save_cache)
+        return cls._traits_cache
+
+    @classmethod
+    def _trim(cls, cache: "OrderedDict[bytes, Dict[str, Any]]"):
+        while len(cache) > TRAITS_CACHE_MAX_ENTRIES:
+            cache.popitem(last=False)
+
+    @classmethod
+    def save_cache(cls):
+        """
+        Persist the traits cache. Entries another process saved meanwhile are kept,
+        and the file is replaced atomically. Failures are ignored; the cache is only
+        an optimisation.
+        """
+        if not cls._cache_dirty:
+            return
+        merged = OrderedDict(cls._read_cache_file())
+        merged.update(cls._traits_cache)
+        cls._trim(merged)
+        payload = {"version": TRAITS_VERSION, "traits": dict(merged)}
+        try:
+            write_atomic(TRAITS_CACHE_PATH, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+            cls._cache_dirty = False
+        except OSError:
+            pass
+
     def extract_traits(self, code: str) -> Dict[str, Any]:
         """
         Extracts structural traits from code to identify implementation style.
         """
+        cache = self._load_cache()
+        key = hashlib.blake2b(code.encode(), digest_size=16).digest()
+        traits = cache.get(key)
+        if traits is None:
+            traits = cache[key] = self._parse_traits(code)
+            self._trim(cache)
+            PatternMatcher._cache_dirty = True
+        else:
+            cache.move_to_end(key)
+        # Callers get their own copy so the cached entry stays intact
+        return dict(traits)
+
+    @staticmethod
+    def _parse_traits(code: str) -> Dict[str, Any]:
         try:
             tree = ast.parse(code)
         except SyntaxError:
             return {}
 
-        traits = {
-            "has_list_comp": 0,
-            "has_for_loop": 0,
-            "has_try_except": 0,
-            "has_nested_functions": 0,
-            "async_count": 0,
-            "docstring_present": False
-        }
-
-        for node in ast.walk(tree):
-            if isinstance(node, ast.ListComp):
-                traits["has_list_comp"] += 1
-            elif isinstance(node, ast.For):
-                traits["has_for_loop"] += 1
-            elif isinstance(node, ast.Try):
-                traits["has_try_except"] += 1
-            elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                if isinstance(node, ast.AsyncFunctionDef):
-                    traits["async_count"] += 1
-                # Check for nested functions
-                for child in node.body:
-                    if isinstance(child, (ast.FunctionDef, ast.AsyncFunctionDef)):
-                        traits["has_nested_functions"] += 1
-                
-                # Check for docstring
-                if ast.get_docstring(node):
-                    traits["docstring_present"] = True
-
-        return traits
+        visitor = _TraitVisitor()
+        visitor.visit(tree)
+        return visitor.traits
 
     def calculate_variance(self, traits_list: List[Dict[str, Any]]) -> float:
         """
         Calculates a simple 'variance' score between implementation styles.
         0.0 means perfectly consistent, higher means less consistent.
         """
-        if not traits_list:
-            return 0.0
-            
-        # Simplified: check how many have docstrings vs not
-        docstrings = [t.get("docstring_present", False) for t in traits_list]
-        doc_count = sum(docstrings)
-        
-        if doc_count == 0 or doc_count == len(traits_list):
+        # Simplified: check whether docstring presence differs anywhere, stopping at the first mismatch
+        docstrings = (bool(t.get("docstring_present", False)) for t in traits_list)
+        first = next(docstrings, None)
+        if first is None or all(d == first for d in docstrings):
             return 0.0
         
         return 1.0 # Some variation exists
@@ -1,19 +1,173 @@
-from ai_collab_analyzer.storage.models import init_db, get_session, RepositoryRecord, AnalysisResultRecord
+from ai_collab_analyzer.storage.models import init_db, init_search_index, get_session, encode_full_data, RepositoryRecord, AnalysisResultRecord
+from sqlalchemy import bindparam, case, func, or_, select, text
+from sqlalchemy.orm import defer
 from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
 import json
 
+# Rows per multi-row INSERT in bulk_save (6 bound columns each, well inside SQLite's variable limit)
+BULK_INSERT_BATCH = 500
+
+# Search categories and the result type label each one is reported under
+SEARCH_KINDS = {'prompt': 'Prompt', 'commit': 'Commit', 'file': 'File'}
+
+def _risk_meta(score) -> str:
+    try:
+        return f"Risk: {score:.1f}"
+    except (TypeError, ValueError):
+        return f"Risk: {score}"
+
+def _search_rows(data: dict) -> Iterator[Tuple[str, str, str, str]]:
+    """
+    Flatten an analysis result into (kind, lowercased content, display text, meta)
+    rows, in the order SearchController reports matches.
+    """
+    for p in data.get('prompts', []):
+        content = (p.get('content') or '').lower()
+        yield 'prompt', content, content[:100] + "...", p.get('author', 'Unknown')
+
+    for pat in data.get('patterns', []):
+        msg = (pat.get('message') or '').lower()
+        yield 'commit', msg, msg, pat.get('author', 'Unknown')
+
+    files = data.get('risk_scores', {})
+    if isinstance(files, dict):
+        for f, score in files.items():
+            yield 'file', f.lower(), f, _risk_meta(score)
+    elif isinstance(files, list):
+        for item in files:
+            if isinstance(item, dict):
+                f = item.get('file') or item.get('filepath')
+                score = item.get('risk_score') or item.get('score') or item.get('risk') or 0
+                if f:
+                    yield 'file', f.lower(), f, _risk_meta(score)
+
 class DatabaseManager:
-    def __init__(self, db_url="sqlite:///ai_collab.db"):
-        self.engine = init_db(db_url)
-        self.session = get_session(self.engine)
+    def __init__(self, db_url="sqlite:///ai_collab.db", engine=None, session=None):
+        owns_engine = engine is None
+        self.engine = init_db(db_url) if owns_engine else engine
+        self.Session = get_session(self.engine)
+        # A dedicated session (one per API request) takes precedence over the thread-scoped one
+        self._session = session
+        self.search_index = False
+        if owns_engine:
+            self.search_index, created = init_search_index(self.engine)
+            if created:
+                # Backfill an index added to an existing database
+                self.rebuild_search_index()
+
+    @property
+    def session(self):
+        return self._session if self._session is not None else self.Session()
+
+    def request_scope(self) -> "DatabaseManager":
+        """
+        A manager sharing this engine but holding its own session, for one unit
+        of work such as an API request. Call close() when done.
+        """
+        scoped = DatabaseManager(engine=self.engine, session=self.Session.session_factory())
+        scoped.search_index = self.search_index
+        return scoped
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+        else:
+            self.Session.remove()
 
     def save_analysis(self, repo_name: str, repo_path: str, result: dict):
+        try:
+            analysis_record = self._add_analysis(repo_name, repo_path, result)
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return analysis_record.id
+
+    def save_analyses(self, rows: List[Tuple[str, str, dict]]) -> List[int]:
+        """
+        Save many (repo_name, repo_path, result) rows in a single transaction,
+        so a bulk import pays for one commit instead of one per analysis.
+        """
+        try:
+            records = [self._add_analysis(name, path, result) for name, path, result in rows]
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+        return [r.id for r in records]
+
+    def bulk_save(self, records: Iterable[Tuple], batch_size: int = BULK_INSERT_BATCH) -> int:
+        """
+        Insert many analyses through SQLAlchemy Core, skipping ORM object construction
+        and identity-map bookkeeping; meant for backfilling historical results.
+        records: (repo_name, repo_path, result) or (repo_name, repo_path, result, timestamp).
+        Everything is inserted in one transaction; returns the number of analyses saved.
+        """
+        results_table = AnalysisResultRecord.__table__
+        repos_table = RepositoryRecord.__table__
+        now = datetime.utcnow()
+        saved = 0
+        with self.engine.begin() as conn:
+            repo_ids = dict(conn.execute(select(repos_table.c.name, repos_table.c.id)).all())
+            latest: Dict[int, datetime] = {}
+            batch = []
+            for name, path, result, *rest in records:
+                repo_id = repo_ids.get(name)
+                if repo_id is None:
+                    repo_id = repo_ids[name] = conn.execute(
+                        repos_table.insert().values(name=name, path=path, last_analyzed=now)
+                    ).inserted_primary_key[0]
+                timestamp = rest[0] if rest else now
+                latest[repo_id] = max(timestamp, latest.get(repo_id, timestamp))
+                batch.append({
+                    "repo_id": repo_id,
+                    "timestamp": timestamp,
+                    "health_score": result.get('health_score', 0),
+                    "coherence_score": result.get('coherence_score', 0),
+                    "risk_score": result.get('overall_risk_score', 0),
+                    # Serialized up front so the insert is plain executemany
+                    "full_data_blob": encode_full_data(result),
+                })
+                if len(batch) >= batch_size:
+                    conn.execute(results_table.insert(), batch)
+                    saved += len(batch)
+                    batch = []
+            if batch:
+                conn.execute(results_table.insert(), batch)
+                saved += len(batch)
+            if latest:
+                # Only ever move last_analyzed forward: a backfill of older analyses must not rewind it
+                last = repos_table.c.last_analyzed
+                conn.execute(
+                    repos_table.update().where(repos_table.c.id == bindparam("repo_id")).values(
+                        last_analyzed=case((or_(last.is_(None), last < bindparam("ts")), bindparam("ts")), else_=last)
+                    ),
+                    [{"repo_id": repo_id, "ts": ts} for repo_id, ts in latest.items()]
+                )
+
+        if self.search_index and latest:
+            self._reindex_repositories(latest.keys())
+        return saved
+
+    def _reindex_repositories(self, repo_ids: Iterable[int]):
+        # Refresh the search rows of repositories whose latest analysis may have changed
+        try:
+            for repo, data in self.iter_latest_full_data(repo_ids):
+                self._index_search_rows(repo, data or {})
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
+
+    def _add_analysis(self, repo_name: str, repo_path: str, result: dict) -> AnalysisResultRecord:
         # Find or create repository
         repo = self.session.query(RepositoryRecord).filter_by(name=repo_name).first()
         if not repo:
             repo = RepositoryRecord(name=repo_name, path=repo_path)
             self.session.add(repo)
-            self.session.commit()
+            # Flush to get repo.id without committing; the caller commits once
+            self.session.flush()
 
         # Create analysis record
         # Note: We strip some non-serializable objects if needed, 
@@ -38,18 +192,128 @@ class DatabaseManager:
         
         repo.last_analyzed = datetime.utcnow()
         self.session.add(analysis_record)
-        self.session.commit()
-        return analysis_record.id
+        if self.search_index:
+            self._index_search_rows(repo, result)
+        return analysis_record
+
+    def _index_search_rows(self, repo: RepositoryRecord, data: dict):
+        # Only the latest analysis of a repository is searchable
+        self.session.execute(text("DELETE FROM search_fts WHERE repo_id = :repo_id"), {"repo_id": repo.id})
+        rows = [
+            {"repo_id": repo.id, "repo": repo.name, "kind": kind, "content": content, "display": display, "meta": meta}
+            for kind, content, display, meta in _search_rows(data)
+        ]
+        if rows:
+            self.session.execute(
+                text("INSERT INTO search_fts (repo_id, repo, kind, content, display, meta) "
+                     "VALUES (:repo_id, :repo, :kind, :content, :display, :meta)"),
+                rows
+            )
+
+    def rebuild_search_index(self):
+        """
+        Repopulate the search index from the latest analysis of every repository.
+        """
+        try:
+            self.session.execute(text("DELETE FROM search_fts"))
+            for repo, data in self.iter_latest_full_data():
+                self._index_search_rows(repo, data or {})
+            self.session.commit()
+        except Exception:
+            self.session.rollback()
+            raise
 
-    def get_latest_results(self, repo_name: str, limit: int = 5):
+    def search(self, query: str, category: str = 'all', limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Case-insensitive substring search over the latest analysis of every repository.
+        limit/offset page through the matches. Requires the search index (see search_index).
+        """
+        # Escape LIKE wildcards so the query is matched literally
+        pattern = '%' + query.lower().replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_') + '%'
+        sql = "SELECT repo, kind, display, meta FROM search_fts WHERE content LIKE :pattern ESCAPE '\\'"
+        params = {"pattern": pattern}
+        if category != 'all':
+            sql += " AND kind = :kind"
+            params["kind"] = category
+        sql += " ORDER BY repo_id, rowid"
+        if limit is not None or offset:
+            # SQLite reads a negative LIMIT as no limit
+            sql += " LIMIT :limit OFFSET :offset"
+            params.update(limit=-1 if limit is None else limit, offset=offset)
+        return [
+            {'repo': repo, 'type': SEARCH_KINDS[kind], 'match': display, 'meta': meta}
+            for repo, kind, display, meta in self.session.execute(text(sql), params)
+        ]
+
+    def get_latest_results(self, repo_name: str, limit: int = 5, include_data: bool = True):
+        """
+        Latest analyses of a repository, newest first. With include_data=False the
+        compressed full_data is deferred and only loaded if a caller touches it.
+        """
         repo = self.session.query(RepositoryRecord).filter_by(name=repo_name).first()
         if not repo:
             return []
         
-        return self.session.query(AnalysisResultRecord)\
+        query = self.session.query(AnalysisResultRecord)
+        if not include_data:
+            query = query.options(defer(AnalysisResultRecord.full_data_blob))
+        return query\
             .filter_by(repo_id=repo.id)\
             .order_by(AnalysisResultRecord.timestamp.desc())\
             .limit(limit).all()
 
+    def get_trend_rows(self, repo_name: str, limit: int = 20):
+        """
+        (timestamp, health_score, coherence_score, risk_score) rows, newest first,
+        selected without touching the full_data_blob column.
+        """
+        return self.session.query(
+                AnalysisResultRecord.timestamp,
+                AnalysisResultRecord.health_score,
+                AnalysisResultRecord.coherence_score,
+                AnalysisResultRecord.risk_score
+            )\
+            .join(RepositoryRecord, AnalysisResultRecord.repo_id == RepositoryRecord.id)\
+            .filter(RepositoryRecord.name == repo_name)\
+            .order_by(AnalysisResultRecord.timestamp.desc())\
+            .limit(limit).all()
+
+    def iter_latest_results(self, repo_ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[RepositoryRecord, AnalysisResultRecord]]:
+        """
+        (repository, latest analysis) for every analysed repository, or only for
+        repo_ids when given, fetched in one query instead of one get_latest_results
+        call per repository.
+        """
+        ranked = self.session.query(
+                AnalysisResultRecord.id,
+                AnalysisResultRecord.repo_id,
+                func.row_number().over(
+                    partition_by=AnalysisResultRecord.repo_id,
+                    order_by=(AnalysisResultRecord.timestamp.desc(), AnalysisResultRecord.id.desc())
+                ).label("rank")
+            ).subquery()
+        rows = self.session.query(RepositoryRecord, AnalysisResultRecord)\
+            .join(ranked, ranked.c.repo_id == RepositoryRecord.id)\
+            .join(AnalysisResultRecord, AnalysisResultRecord.id == ranked.c.id)\
+            .filter(ranked.c.rank == 1)\
+            .order_by(RepositoryRecord.id)
+        if repo_ids is not None:
+            rows = rows.filter(RepositoryRecord.id.in_(list(repo_ids)))
+        return iter(rows)
+
+    def iter_latest_full_data(self, repo_ids: Optional[Iterable[int]] = None) -> Iterator[Tuple[RepositoryRecord, Any]]:
+        """
+        (repository, full_data) for the latest analysis of every analysed repository.
+        """
+        for repo, record in self.iter_latest_results(repo_ids):
+            yield repo, record.full_data
+
+    def data_version(self) -> str:
+        """
+        Changes whenever an analysis is saved; lets API clients revalidate cached responses.
+        """
+        count, last_id = self.session.query(func.count(AnalysisResultRecord.id), func.max(AnalysisResultRecord.id)).one()
+        return f"{count}-{last_id or 0}"
+
     def list_repositories(self):
         return self.session.query(RepositoryRecord).all()
@@ -0,0 +1,21 @@
+"""
+One-shot conversion of stored analyses from the JSON full_data column to the
+compressed full_data_blob column.
+
+    python -m ai_collab_analyzer.storage.migrate_full_data [db_url]
+
+init_db runs the same migration on startup, so this is only needed to convert
+a database ahead of time.
+"""
+import sys
+from sqlalchemy import create_engine
+from ai_collab_analyzer.storage.models import Base, migrate_full_data
+
+def main(db_url: str = "sqlite:///ai_collab.db"):
+    engine = create_engine(db_url)
+    Base.metadata.create_all(engine)
+    converted = migrate_full_data(engine)
+    print(f"Converted {converted} analysis records.")
+
+if __name__ == "__main__":
+    main(*sys.argv[1:2])
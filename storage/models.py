@@ -1,7 +1,44 @@
-from sqlalchemy import create_engine, Column, Integer, String, Float, DateTime, JSON, ForeignKey
+from sqlalchemy import create_engine, event, inspect, text, Column, Index, Integer, String, Float, DateTime, LargeBinary, ForeignKey
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, relationship
+from sqlalchemy.orm import scoped_session, sessionmaker, relationship
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.pool import StaticPool
 from datetime import datetime
+from typing import Any, Optional, Tuple
+import json
+import zlib
+
+try:
+    import msgpack
+    import zstandard
+except ImportError:
+    msgpack = zstandard = None
+
+# First byte of a stored full_data blob names its encoding
+_ZSTD_MSGPACK = b"\x01"
+_ZLIB_JSON = b"\x00"
+ZSTD_LEVEL = 3
+
+def encode_full_data(data: Any) -> Optional[bytes]:
+    """
+    Pack an analysis result for storage: zstd-compressed msgpack when both
+    optional packages are installed, zlib-compressed JSON otherwise.
+    """
+    if data is None:
+        return None
+    if msgpack is not None:
+        return _ZSTD_MSGPACK + zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(msgpack.packb(data))
+    return _ZLIB_JSON + zlib.compress(json.dumps(data).encode("utf-8"))
+
+def decode_full_data(blob: Optional[bytes]) -> Any:
+    if blob is None:
+        return None
+    tag, payload = blob[:1], blob[1:]
+    if tag == _ZSTD_MSGPACK:
+        if msgpack is None:
+            raise ImportError("Reading this analysis requires the msgpack and zstandard packages")
+        return msgpack.unpackb(zstandard.ZstdDecompressor().decompress(payload))
+    return json.loads(zlib.decompress(payload))
 
 Base = declarative_base()
 
@@ -9,7 +46,7 @@ class RepositoryRecord(Base):
     __tablename__ = 'repositories'
     
     id = Column(Integer, primary_key=True)
-    name = Column(String, unique=True, nullable=False)
+    name = Column(String, unique=True, index=True, nullable=False)
     path = Column(String, nullable=False)
     last_analyzed = Column(DateTime, default=datetime.utcnow)
     
@@ -27,16 +64,110 @@ class AnalysisResultRecord(Base):
     coherence_score = Column(Float)
     risk_score = Column(Float)
     
-    # Full Result Data (JSON)
-    full_data = Column(JSON)
+    # Full Result Data, compressed (see encode_full_data); read and written through full_data
+    full_data_blob = Column(LargeBinary)
     
     repository = relationship("RepositoryRecord", back_populates="results")
 
+    # Serves "latest results for a repo" without scanning or sorting the table
+    __table_args__ = (
+        Index('ix_results_repo_ts', 'repo_id', 'timestamp'),
+    )
+
+    @property
+    def full_data(self) -> Any:
+        return decode_full_data(self.full_data_blob)
+
+    @full_data.setter
+    def full_data(self, data: Any):
+        self.full_data_blob = encode_full_data(data)
+
+# WAL lets readers proceed during a write; NORMAL sync is safe under WAL; ~64MB page cache
+SQLITE_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA cache_size=-65536",
+)
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    for pragma in SQLITE_PRAGMAS:
+        cursor.execute(pragma)
+    cursor.close()
+
 def init_db(db_url="sqlite:///ai_collab.db"):
-    engine = create_engine(db_url)
+    engine_kwargs = {}
+    if db_url.startswith("sqlite"):
+        # Pooled connections are handed to whichever thread serves the request
+        engine_kwargs["connect_args"] = {"check_same_thread": False}
+        if db_url in ("sqlite://", "sqlite:///:memory:"):
+            # An in-memory database only exists on its one connection
+            engine_kwargs["poolclass"] = StaticPool
+    engine = create_engine(db_url, **engine_kwargs)
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _apply_sqlite_pragmas)
     Base.metadata.create_all(engine)
+    # create_all only indexes new tables; add the indexes to databases created before them
+    for index in AnalysisResultRecord.__table__.indexes | RepositoryRecord.__table__.indexes:
+        index.create(engine, checkfirst=True)
+    migrate_full_data(engine)
     return engine
 
+def migrate_full_data(engine, batch_size: int = 500) -> int:
+    """
+    Convert analysis rows from the former JSON full_data column into full_data_blob.
+    Adds the blob column to an old table first; returns the number of rows converted.
+    A no-op on databases created after the switch.
+    """
+    columns = {c["name"] for c in inspect(engine).get_columns(AnalysisResultRecord.__tablename__)}
+    if "full_data" not in columns:
+        return 0
+
+    converted = 0
+    with engine.begin() as conn:
+        if "full_data_blob" not in columns:
+            conn.execute(text("ALTER TABLE analysis_results ADD COLUMN full_data_blob BLOB"))
+        while True:
+            rows = conn.execute(
+                text("SELECT id, full_data FROM analysis_results "
+                     "WHERE full_data IS NOT NULL AND full_data_blob IS NULL LIMIT :n"),
+                {"n": batch_size}
+            ).all()
+            if not rows:
+                break
+            conn.execute(
+                text("UPDATE analysis_results SET full_data_blob = :blob, full_data = NULL WHERE id = :id"),
+                [{"id": row_id, "blob": encode_full_data(json.loads(raw))} for row_id, raw in rows]
+            )
+            converted += len(rows)
+    return converted
+
+# Denormalized, lowercased search text for the latest analysis of each repository.
+# The trigram tokenizer lets FTS5 serve substring LIKE queries from its index.
+SEARCH_FTS_DDL = (
+    "CREATE VIRTUAL TABLE search_fts USING fts5("
+    "repo_id UNINDEXED, repo UNINDEXED, kind UNINDEXED, content, display UNINDEXED, meta UNINDEXED, "
+    "tokenize='trigram')"
+)
+
+def init_search_index(engine) -> Tuple[bool, bool]:
+    """
+    Create the FTS5 search table if missing.
+    Returns (available, created); unavailable on non-SQLite engines or SQLite builds without FTS5 trigram support.
+    """
+    if engine.dialect.name != "sqlite":
+        return False, False
+    with engine.begin() as conn:
+        if conn.execute(text("SELECT 1 FROM sqlite_master WHERE name = 'search_fts'")).first():
+            return True, False
+        try:
+            conn.execute(text(SEARCH_FTS_DDL))
+        except OperationalError:
+            return False, False
+    return True, True
+
 def get_session(engine):
-    Session = sessionmaker(bind=engine)
-    return Session()
+    """
+    Thread-scoped session registry: calling it returns the current thread's session.
+    """
+    return scoped_session(sessionmaker(bind=engine))
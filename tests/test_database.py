@@ -0,0 +1,30 @@
+from datetime import datetime, timedelta
+
+from ai_collab_analyzer.storage.database import DatabaseManager
+from ai_collab_analyzer.storage.models import RepositoryRecord
+
+
+def _last_analyzed(db, name):
+    db.session.expire_all()
+    return db.session.query(RepositoryRecord).filter_by(name=name).one().last_analyzed
+
+
+def test_bulk_save_backfill_does_not_rewind_last_analyzed():
+    db = DatabaseManager("sqlite://")
+    db.save_analysis("repo", "/repo", {"health_score": 80})
+    current = _last_analyzed(db, "repo")
+
+    older = [("repo", "/repo", {"health_score": 50}, current - timedelta(days=d)) for d in (30, 60)]
+    assert db.bulk_save(older) == 2
+    assert _last_analyzed(db, "repo") == current
+
+    newer = current + timedelta(days=1)
+    db.bulk_save([("repo", "/repo", {"health_score": 90}, newer)])
+    assert _last_analyzed(db, "repo") == newer
+
+
+def test_bulk_save_keeps_creation_time_of_new_repository():
+    db = DatabaseManager("sqlite://")
+    before = datetime.utcnow()
+    db.bulk_save([("fresh", "/fresh", {"health_score": 70}, datetime(2020, 1, 1))])
+    assert _last_analyzed(db, "fresh") >= before
@@ -0,0 +1,40 @@
+import ast
+
+from ai_collab_analyzer.metrics.performance_metrics import PerformanceMetricsCalculator
+
+
+def _leak_lines(code):
+    tree = ast.parse(code)
+    return [issue["line_number"] for issue in PerformanceMetricsCalculator().check_resource_management(tree)]
+
+
+def test_open_as_with_context_expression_is_managed():
+    code = (
+        "with open('a') as f:\n"
+        "    pass\n"
+        "with open('b') as f, open('c') as g:\n"
+        "    pass\n"
+    )
+    assert _leak_lines(code) == []
+
+
+def test_open_elsewhere_is_reported_in_source_order():
+    code = (
+        "f = open('a')\n"                     # 1: plain assignment
+        "with open('b') as g:\n"              # 2: managed
+        "    h = open('c')\n"                 # 3: inside the with body
+        "with closing(open('d')) as i:\n"     # 4: wrapped, not the context expression itself
+        "    pass\n"
+        "def load():\n"
+        "    return open('e').read()\n"       # 7
+    )
+    assert _leak_lines(code) == [1, 3, 4, 7]
+
+
+def test_async_with_context_expression_is_managed():
+    code = (
+        "async def main():\n"
+        "    async with open('a') as f:\n"
+        "        pass\n"
+    )
+    assert _leak_lines(code) == []
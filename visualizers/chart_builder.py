@@ -1,8 +1,12 @@
+import numpy as np
 import plotly.graph_objs as go
 import plotly.express as px
 from typing import List, Dict, Any
 from datetime import datetime
 
+# Bars beyond this many files are dropped; the busiest files are kept
+HOTSPOT_TOP_K = 50
+
 class ChartBuilder:
     """
     Builds visualizations for repository analysis.
@@ -44,26 +48,21 @@ class ChartBuilder:
                 annotation_position="top left"
             )
             
-        # Plot Regenerations (as points)
-        regen_x = []
-        regen_y = []
-        regen_text = []
-        
-        for regen in regenerations:
-            for commit in regen.commits:
-                if commit.date:
-                    regen_x.append(commit.date)
-                    regen_y.append(commit.total_changes)
-                    regen_text.append(f"Regeneration: {regen.filepath}<br>{commit.message}")
-                    
-        if regen_x:
-            fig.add_trace(go.Scatter(
+        # Plot Regenerations (as points), one WebGL trace for all commits
+        regen_commits = [(regen.filepath, commit) for regen in regenerations for commit in regen.commits if commit.date]
+
+        if regen_commits:
+            n = len(regen_commits)
+            # Wall-clock commit times; plotly has no notion of time zones
+            regen_x = np.array([c.date.replace(tzinfo=None) for _, c in regen_commits], dtype='datetime64[s]')
+            regen_y = np.fromiter((c.total_changes for _, c in regen_commits), dtype=np.int32, count=n)
+            fig.add_trace(go.Scattergl(
                 x=regen_x, y=regen_y,
                 mode='markers',
                 marker=dict(color='red', size=10, symbol='diamond'),
                 name='Regenerations',
-                text=regen_text,
-                hoverinfo='text'
+                customdata=[(filepath, c.message) for filepath, c in regen_commits],
+                hovertemplate="Regeneration: %{customdata[0]}<br>%{customdata[1]}<extra></extra>"
             ))
             
         fig.update_layout(
@@ -83,10 +82,16 @@ class ChartBuilder:
         if not hotspots:
             return go.Figure()
 
-        # Extract data
-        filepaths = [h.filepath for h in hotspots]
-        counts = [h.change_count for h in hotspots]
-        churns = [h.churn_rate for h in hotspots]
+        # Extract data, busiest files first (stable, so ties keep their input order)
+        arr = np.fromiter(
+            ((h.change_count, h.churn_rate) for h in hotspots),
+            dtype=[('count', 'i8'), ('churn', 'f8')],
+            count=len(hotspots)
+        )
+        idx = np.argsort(-arr['count'], kind='stable')[:HOTSPOT_TOP_K]
+        filepaths = [hotspots[i].filepath for i in idx]
+        counts = arr['count'][idx]
+        churns = arr['churn'][idx]
         
         fig = go.Figure(data=[
             go.Bar(name='Change Count', x=filepaths, y=counts),
@@ -1,12 +1,64 @@
 import networkx as nx
+import numpy as np
 import plotly.graph_objects as go
 from typing import Dict, Any, List
+import hashlib
+import importlib.util
+import os
+import pickle
+from ai_collab_analyzer.core.disk_cache import prune, touch, write_atomic
+
+LAYOUT_CACHE_DIR = os.path.expanduser("~/.cache/ai_collab_analyzer/layout")
+# Bump when the layout computation changes
+LAYOUT_CACHE_VERSION = 1
+# Least recently used layouts beyond this count are deleted
+LAYOUT_CACHE_MAX_FILES = 500
+# Above this many files the pure-Python Fruchterman-Reingold layout is handed to graphviz
+LARGE_GRAPH_NODES = 500
+
+# sfdp layout needs the optional pygraphviz package
+HAS_PYGRAPHVIZ = importlib.util.find_spec("pygraphviz") is not None
 
 class NetworkVisualizer:
     """
     Visualizes network graphs using Plotly.
     """
     
+    @staticmethod
+    def _layout(G: nx.Graph) -> Dict[Any, Any]:
+        """
+        Node positions for the coupling graph, reused from disk for a graph seen before.
+        The key covers node order and edge weights, both of which affect the layout.
+        """
+        use_sfdp = HAS_PYGRAPHVIZ and G.number_of_nodes() >= LARGE_GRAPH_NODES
+        fingerprint = repr((LAYOUT_CACHE_VERSION, nx.__version__, use_sfdp, list(G.nodes()), list(G.edges(data='weight'))))
+        key = hashlib.blake2b(fingerprint.encode(), digest_size=8).hexdigest()
+        cache_path = os.path.join(LAYOUT_CACHE_DIR, f"{key}.pkl")
+        try:
+            with open(cache_path, "rb") as f:
+                pos = pickle.load(f)
+            touch(cache_path)
+            return pos
+        except (OSError, pickle.UnpicklingError, EOFError):
+            pass
+
+        pos = None
+        if use_sfdp:
+            try:
+                pos = nx.nx_agraph.graphviz_layout(G, prog='sfdp')
+            except (ImportError, OSError, ValueError):
+                # graphviz binaries missing or failing; fall back to spring layout
+                pos = None
+        if pos is None:
+            pos = nx.spring_layout(G, seed=42, iterations=50)
+
+        try:
+            write_atomic(cache_path, pickle.dumps(pos, protocol=pickle.HIGHEST_PROTOCOL))
+            prune(LAYOUT_CACHE_DIR, LAYOUT_CACHE_MAX_FILES)
+        except OSError:
+            pass
+        return pos
+
     def create_coupling_chart(self, coupling_data: Dict[str, Any]) -> go.Figure:
         """
         Create a network diagram of file coupling.
@@ -22,23 +74,19 @@ class NetworkVisualizer:
             G.add_edge(edge["source"], edge["target"], weight=edge["weight"])
             
         # Layout
-        pos = nx.spring_layout(G, seed=42)
-        
-        # Edges
-        edge_x = []
-        edge_y = []
-        texts = []
+        pos = self._layout(G)
         
-        for edge in G.edges(data=True):
-            x0, y0 = pos[edge[0]]
-            x1, y1 = pos[edge[1]]
-            edge_x.append(x0)
-            edge_x.append(x1)
-            edge_x.append(None)
-            edge_y.append(y0)
-            edge_y.append(y1)
-            edge_y.append(None)
-            texts.append(f"Coupling: {edge[2].get('weight', 1)}")
+        # Edges: (x0, x1, NaN) per edge so Plotly draws them as separate segments
+        E = G.number_of_edges()
+        edge_x = np.empty(3 * E)
+        edge_y = np.empty(3 * E)
+        edge_x[2::3] = np.nan
+        edge_y[2::3] = np.nan
+        edge_x[0::3] = np.fromiter((pos[u][0] for u, v in G.edges()), float, E)
+        edge_x[1::3] = np.fromiter((pos[v][0] for u, v in G.edges()), float, E)
+        edge_y[0::3] = np.fromiter((pos[u][1] for u, v in G.edges()), float, E)
+        edge_y[1::3] = np.fromiter((pos[v][1] for u, v in G.edges()), float, E)
+        texts = [f"Coupling: {w}" for _, _, w in G.edges(data='weight', default=1)]
 
         edge_trace = go.Scatter(
             x=edge_x, y=edge_y,
@@ -48,15 +96,10 @@ class NetworkVisualizer:
             mode='lines')
 
         # Nodes
-        node_x = []
-        node_y = []
-        node_text = []
-        
-        for node in G.nodes():
-            x, y = pos[node]
-            node_x.append(x)
-            node_y.append(y)
-            node_text.append(str(node))
+        V = G.number_of_nodes()
+        node_x = np.fromiter((pos[node][0] for node in G.nodes()), float, V)
+        node_y = np.fromiter((pos[node][1] for node in G.nodes()), float, V)
+        node_text = [str(node) for node in G.nodes()]
 
         node_trace = go.Scatter(
             x=node_x, y=node_y,
@@ -77,11 +120,7 @@ class NetworkVisualizer:
                 line_width=2))
                 
         # Color by degree
-        node_adjacencies = []
-        for node, adjacencies in enumerate(G.adjacency()):
-            node_adjacencies.append(len(adjacencies[1]))
-            
-        node_trace.marker.color = node_adjacencies
+        node_trace.marker.color = np.fromiter((len(adj) for _, adj in G.adjacency()), int, V)
 
         fig = go.Figure(data=[edge_trace, node_trace],
              layout=go.Layout(
@@ -1,5 +1,6 @@
 import plotly.graph_objects as go
-from typing import Dict, List
+import plotly.io as pio
+from typing import Dict, List, Optional
 
 class RadarChartBuilder:
     """
@@ -9,11 +10,27 @@ class RadarChartBuilder:
     def create_perspective_radar(self, aggregate_scores: Dict[str, float]) -> str:
         """
         Create a radar chart of perspective scores.
-        Returns HTML div string.
+        Returns HTML div string; the page is expected to load plotly.js once itself.
         """
         if not aggregate_scores:
             return "<div>No perspective data available</div>"
             
+        return self.create_perspective_figure(aggregate_scores).to_html(full_html=False, include_plotlyjs=False, validate=False)
+
+    def create_perspective_json(self, aggregate_scores: Dict[str, float]) -> Optional[str]:
+        """
+        Serialize the radar figure as plotly JSON for clients that render it with
+        their own cached plotly bundle. Uses orjson when installed.
+        """
+        if not aggregate_scores:
+            return None
+
+        return pio.to_json(self.create_perspective_figure(aggregate_scores), validate=False)
+
+    def create_perspective_figure(self, aggregate_scores: Dict[str, float]) -> go.Figure:
+        """
+        Create the radar figure itself, for callers that render it differently.
+        """
         categories = list(aggregate_scores.keys())
         values = list(aggregate_scores.values())
         
@@ -42,4 +59,4 @@ class RadarChartBuilder:
             margin=dict(l=50, r=50, t=50, b=50)
         )
         
-        return fig.to_html(full_html=False, include_plotlyjs='cdn')
+        return fig
@@ -1,39 +1,51 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from ai_collab_analyzer.storage.database import DatabaseManager
 from ai_collab_analyzer.multi_repo.aggregator import MultiRepoAggregator
 from ai_collab_analyzer.benchmarking.benchmark_calculator import BenchmarkCalculator
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 app = FastAPI(title="AI Collaboration Analyzer API")
-db = DatabaseManager()
+# Owns the engine and connection pool; each request works on its own session
+database = DatabaseManager()
+
+def get_db():
+    # FastAPI may run setup, endpoint and teardown on different worker threads,
+    # so requests get an explicit session rather than the thread-scoped one
+    db = database.request_scope()
+    try:
+        yield db
+    finally:
+        db.close()
 
 @app.get("/")
 def read_root():
     return {"status": "online", "message": "AI Collaboration Analyzer API"}
 
 @app.get("/repositories")
-def list_repos():
+def list_repos(db: DatabaseManager = Depends(get_db)):
     repos = db.list_repositories()
     return [{"id": r.id, "name": r.name, "path": r.path, "last_analyzed": r.last_analyzed} for r in repos]
 
 @app.get("/repositories/{repo_name}/results")
-def get_results(repo_name: str, limit: int = 10):
+def get_results(repo_name: str, limit: int = 10, db: DatabaseManager = Depends(get_db)):
     results = db.get_latest_results(repo_name, limit)
-    return [
-        {
-            "id": r.id,
-            "timestamp": r.timestamp,
-            "health_score": r.health_score,
-            "coherence_score": r.coherence_score,
-            "risk_score": r.risk_score,
-            "data": r.full_data
-        } 
-        for r in results
-    ]
+    return [_result_payload(r) for r in results]
+
+def _result_payload(r):
+    return {
+        "id": r.id,
+        "timestamp": r.timestamp,
+        "health_score": r.health_score,
+        "coherence_score": r.coherence_score,
+        "risk_score": r.risk_score,
+        "data": r.full_data
+    }
 
 @app.get("/repositories/{repo_name}/trends")
-def get_trends(repo_name: str):
-    results = db.get_latest_results(repo_name, limit=20)
+def get_trends(repo_name: str, db: DatabaseManager = Depends(get_db)):
+    return _trends_payload(db.get_trend_rows(repo_name, limit=20))
+
+def _trends_payload(results):
     # Reverse to get chronological order for charts
     results.reverse()
     return {
@@ -45,21 +57,30 @@ def get_trends(repo_name: str):
 
 from ai_collab_analyzer.recommendations.engine import RecommendationEngine
 from ai_collab_analyzer.web.api.routes.search import SearchController
+from ai_collab_analyzer.visualizers.radar_chart_builder import RadarChartBuilder
 
 @app.get("/portfolio")
-def get_portfolio():
+def get_portfolio(request: Request, response: Response, db: DatabaseManager = Depends(get_db)):
+    # Unchanged since the client's copy: skip the aggregation and send headers only
+    etag = f'"{db.data_version()}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+
     aggregator = MultiRepoAggregator(db)
     metrics = aggregator.aggregate_portfolio()
     from dataclasses import asdict
     return asdict(metrics)
 
 @app.get("/repositories/{repo_name}/benchmarks")
-def get_benchmarks(repo_name: str):
-    latest = db.get_latest_results(repo_name, limit=1)
+def get_benchmarks(repo_name: str, db: DatabaseManager = Depends(get_db)):
+    latest = db.get_latest_results(repo_name, limit=1, include_data=False)
     if not latest:
         raise HTTPException(status_code=404, detail="No analysis found")
     
-    res = latest[0]
+    return _benchmarks_payload(latest[0])
+
+def _benchmarks_payload(res):
     calc = BenchmarkCalculator()
     
     benchmarks = [
@@ -72,19 +93,57 @@ def get_benchmarks(repo_name: str):
     return [asdict(b) for b in benchmarks]
 
 @app.get("/repositories/{repo_name}/recommendations")
-def get_recommendations(repo_name: str):
+def get_recommendations(repo_name: str, db: DatabaseManager = Depends(get_db)):
     latest = db.get_latest_results(repo_name, limit=1)
     if not latest:
         raise HTTPException(status_code=404, detail="No analysis found")
     
+    return _recommendations_payload(latest[0].full_data)
+
+def _recommendations_payload(data):
     engine = RecommendationEngine()
-    insights = engine.generate_recommendations(latest[0].full_data)
+    # Analyses stored without full_data get no data-driven recommendations rather than a 500
+    insights = engine.generate_recommendations(data or {})
     
     from dataclasses import asdict
-    return [asdict(i) for i in insights]
+    # Severity is an IntEnum; expose its readable label to API clients
+    return [{**asdict(i), "severity": i.severity.label} for i in insights]
+
+@app.get("/repositories/{repo_name}/perspectives/radar")
+def get_perspective_radar(repo_name: str, db: DatabaseManager = Depends(get_db)):
+    latest = db.get_latest_results(repo_name, limit=1)
+    if not latest:
+        raise HTTPException(status_code=404, detail="No analysis found")
+
+    # Figure JSON only; the client renders it with its own plotly.js.
+    # Rows without full_data fall through to the 404 below
+    figure_json = RadarChartBuilder().create_perspective_json((latest[0].full_data or {}).get('perspective_scores', {}))
+    if figure_json is None:
+        raise HTTPException(status_code=404, detail="No perspective data available")
+    return Response(content=figure_json, media_type="application/json")
 
 @app.get("/search")
-def search(query: str, category: str = "all"):
+def search(query: str, category: str = "all", limit: Optional[int] = Query(None, ge=1), offset: int = Query(0, ge=0),
+           db: DatabaseManager = Depends(get_db)):
     controller = SearchController(db)
-    return controller.search(query, category)
+    return controller.search(query, category, limit=limit, offset=offset)
 
+@app.get("/repositories/{repo_name}/bundle")
+def get_bundle(repo_name: str, db: DatabaseManager = Depends(get_db)):
+    """
+    Trends, latest result, recommendations and benchmarks of a repository in one
+    response, built from a single load of the latest analysis.
+    """
+    latest = db.get_latest_results(repo_name, limit=1)
+    if not latest:
+        raise HTTPException(status_code=404, detail="No analysis found")
+
+    res = latest[0]
+    # full_data is decoded once and shared by the result and the recommendations
+    result = _result_payload(res)
+    return {
+        "trends": _trends_payload(db.get_trend_rows(repo_name, limit=20)),
+        "latest": result,
+        "recommendations": _recommendations_payload(result["data"]),
+        "benchmarks": _benchmarks_payload(res)
+    }
@@ -1,4 +1,5 @@
-from typing import List, Dict, Any
+from itertools import islice
+from typing import Iterator, List, Dict, Any, Optional
 from ai_collab_analyzer.storage.database import DatabaseManager
 
 class SearchController:
@@ -8,30 +9,33 @@ class SearchController:
     def __init__(self, db: DatabaseManager):
         self.db = db
 
-    def search(self, query: str, category: str = 'all') -> List[Dict[str, Any]]:
-        results = []
-        repos = self.db.list_repositories()
+    def search(self, query: str, category: str = 'all', limit: Optional[int] = None, offset: int = 0) -> List[Dict[str, Any]]:
+        """
+        Matches in report order; limit/offset select one page of them.
+        """
+        # The full-text index answers without loading every repository's full_data
+        if self.db.search_index:
+            return self.db.search(query, category, limit=limit, offset=offset)
+
+        stop = None if limit is None else offset + limit
+        return list(islice(self._scan(query, category), offset, stop))
+
+    def _scan(self, query: str, category: str) -> Iterator[Dict[str, Any]]:
         query = query.lower()
 
-        for repo in repos:
-            latest = self.db.get_latest_results(repo.name, limit=1)
-            if not latest:
-                continue
-            
-            data = latest[0].full_data
-            
+        for repo, data in self.db.iter_latest_full_data():
             # Search Prompts
             if category in ['all', 'prompt']:
                 prompts = data.get('prompts', [])
                 for p in prompts:
                     content = p.get('content', '').lower()
                     if query in content:
-                        results.append({
+                        yield {
                             'repo': repo.name,
                             'type': 'Prompt',
                             'match': content[:100] + "...",
                             'meta': p.get('author', 'Unknown')
-                        })
+                        }
 
             # Search Commits
             if category in ['all', 'commit']:
@@ -39,12 +43,12 @@ class SearchController:
                 for pat in patterns:
                     msg = pat.get('message', '').lower()
                     if query in msg:
-                        results.append({
+                        yield {
                             'repo': repo.name,
                             'type': 'Commit',
                             'match': msg,
                             'meta': pat.get('author', 'Unknown')
-                        })
+                        }
             
             # Search Files
             if category in ['all', 'file']:
@@ -52,23 +56,21 @@ class SearchController:
                 if isinstance(files, dict):
                     for f, score in files.items():
                         if query in f.lower():
-                            results.append({
+                            yield {
                                 'repo': repo.name,
                                 'type': 'File',
                                 'match': f,
                                 'meta': f"Risk: {score:.1f}"
-                            })
+                            }
                 elif isinstance(files, list):
                     for item in files:
                         if isinstance(item, dict):
                             f = item.get('file') or item.get('filepath')
                             score = item.get('risk_score') or item.get('score') or item.get('risk') or 0
                             if f and query in f.lower():
-                                results.append({
+                                yield {
                                     'repo': repo.name,
                                     'type': 'File',
                                     'match': f,
                                     'meta': f"Risk: {score:.1f}"
-                                })
-
-        return results
+                                }
@@ -1,13 +1,109 @@
 import streamlit as st
 import requests
-import pandas as pd
-import plotly.express as px
-import plotly.graph_objects as go
+import html
+from requests.adapters import HTTPAdapter, Retry
+import threading
+from collections import OrderedDict
 from datetime import datetime
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 st.set_page_config(page_title="IA Collaboration Insights Platform", layout="wide")
 
 API_URL = "http://localhost:8000"
+# Search hits fetched and rendered per Artifact Explorer page
+SEARCH_PAGE_SIZE = 50
+# Deep-dive sections; only the selected one is rendered
+DEEP_DIVE_SECTIONS = ["Historical Evolution", "Latest Details", "Actionable Insights"]
+# Revalidation entries kept across sessions; each search query/page adds one
+ETAG_STORE_SIZE = 256
+
+@st.cache_resource
+def api_session():
+    """
+    One keep-alive session for every API call, shared across reruns and sessions.
+    A single API host, so one pool sized for concurrent sessions.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=Retry(total=2, backoff_factor=0.1))
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+@st.cache_resource
+def etag_store():
+    # (path, params) -> (ETag, decoded body), least recently used first; shared by every
+    # session, so once the TTL cache expires, unchanged data is revalidated with a
+    # headers-only 304. Sessions run on their own threads, hence the lock.
+    return OrderedDict(), threading.Lock()
+
+@st.cache_data(ttl=60, show_spinner=False)
+def fetch_json(path, params=None):
+    """
+    GET an API path and return the decoded JSON, cached across reruns.
+    Only plain dicts/lists are cached; DataFrames are built by the caller.
+    """
+    # Revalidate with the API's ETag, if it sent one, instead of downloading the body again
+    validators, lock = etag_store()
+    key = (path, tuple(sorted((params or {}).items())))
+    with lock:
+        cached = validators.get(key)
+        if cached:
+            validators.move_to_end(key)
+    headers = {"If-None-Match": cached[0]} if cached else None
+    r = api_session().get(f"{API_URL}{path}", params=params, headers=headers, timeout=5)
+    if r.status_code == 304 and cached:
+        return cached[1]
+    r.raise_for_status()
+    # orjson decodes the raw body far faster than requests' stdlib-based r.json()
+    body = orjson.loads(r.content) if orjson is not None else r.json()
+    etag = r.headers.get("ETag")
+    if etag:
+        with lock:
+            validators[key] = (etag, body)
+            validators.move_to_end(key)
+            if len(validators) > ETAG_STORE_SIZE:
+                validators.popitem(last=False)
+    return body
+
+def api_get(path, params=None):
+    # Failed calls are not cached, so the next rerun retries them
+    try:
+        return fetch_json(path, params)
+    except requests.RequestException:
+        return None
+
+def hotspot_frame(hotspots):
+    import pandas as pd
+    # Build the two chart columns straight from the records: one frame, no rename or reindex
+    files = pd.Index([h['filepath'] for h in hotspots], name='File')
+    return pd.DataFrame({'Commits': [h['change_count'] for h in hotspots]}, index=files)
+
+def metric_tiles(tiles, separator=False):
+    """
+    Render (label, value) tiles, plus an optional rule below them, as a single HTML
+    element instead of a column layout with one st.metric per tile.
+    """
+    cells = "".join(
+        f'<div style="flex:1"><div style="font-size:0.875rem;opacity:0.6">{html.escape(label)}</div>'
+        f'<div style="font-size:2.25rem">{html.escape(str(value))}</div></div>'
+        for label, value in tiles
+    )
+    rule = "<hr>" if separator else ""
+    st.markdown(f'<div style="display:flex;gap:1rem">{cells}</div>{rule}', unsafe_allow_html=True)
+
+def repos_by_name(repos):
+    """
+    Name -> repository lookup, kept in session state and rebuilt only when the
+    repository list changes.
+    """
+    memo = st.session_state.get('repos_by_name')
+    if memo is None or memo[0] != repos:
+        memo = st.session_state['repos_by_name'] = (repos, {r['name']: r for r in repos})
+    return memo[1]
 
 st.title("🧠 Human-AI Collaboration Insights Platform")
 st.markdown("---")
@@ -15,170 +111,199 @@ st.markdown("---")
 # Sidebar - Repo Selection & Mode
 st.sidebar.header("Navigation")
 
+mode = st.sidebar.radio("View Mode", ["Portfolio Overview", "Repository Deep-Dive", "Industry Benchmarks", "Artifact Explorer"])
+
 # Global State
-try:
-    repos_resp = requests.get(f"{API_URL}/repositories")
-    if repos_resp.status_code == 200:
-        repos = repos_resp.json()
-    else:
-        repos = []
-except:
-    repos = []
+repos = api_get("/repositories") or []
 
-mode = st.sidebar.radio("View Mode", ["Portfolio Overview", "Repository Deep-Dive", "Industry Benchmarks", "Artifact Explorer"])
+# Heavy libraries are imported inside the views that use them, so a session only pays
+# for the modes it opens (e.g. benchmarks never loads pandas or plotly).
+# Each view renders in a fragment, so interacting with its widgets reruns only that
+# view instead of the whole script and its API fetches. Sidebar widgets cannot be
+# created inside a fragment, so repository selection stays in the main script.
 
-if mode == "Portfolio Overview":
+@st.fragment
+def portfolio_view():
+    import plotly.graph_objects as go
     st.header("🏢 Portfolio Health & Performance")
     
-    portfolio_resp = requests.get(f"{API_URL}/portfolio")
-    if portfolio_resp.status_code == 200:
-        p = portfolio_resp.json()
-        
-        c1, c2, c3, c4 = st.columns(4)
-        c1.metric("Total Repos", p['total_repos'])
-        c2.metric("Avg Health", f"{p['avg_health_score']:.1f}")
-        c3.metric("Avg Coherence", f"{p['avg_coherence_score']:.1f}")
-        c4.metric("Avg Risk", f"{p['avg_risk_score']:.1f}", delta_color="inverse")
-        
-        st.markdown("---")
+    p = api_get("/portfolio")
+    if p is not None:
+        metric_tiles([
+            ("Total Repos", p['total_repos']),
+            ("Avg Health", f"{p['avg_health_score']:.1f}"),
+            ("Avg Coherence", f"{p['avg_coherence_score']:.1f}"),
+            ("Avg Risk", f"{p['avg_risk_score']:.1f}")
+        ], separator=True)
         
         col_chart, col_files = st.columns([2, 1])
         
         with col_chart:
             st.subheader("Cross-Repository Comparison")
             if p['repo_comparisons']:
-                df_comp = pd.DataFrame(p['repo_comparisons'])
-                fig = px.bar(df_comp, x='name', y=['health', 'coherence', 'risk'], 
-                           barmode='group', title="Metric Comparison across Projects")
-                st.plotly_chart(fig, use_container_width=True)
+                # The API ships each metric as a ready-made column
+                series = p['comparison_series']
+                metrics = ('health', 'coherence', 'risk')
+                # One heatmap cell per repo and metric draws as a single image, however many repos there are;
+                # values show on hover. A sequential scale, since high risk is bad but high health is good.
+                fig = go.Figure(
+                    data=go.Heatmap(
+                        z=[list(row) for row in zip(*(series[col] for col in metrics))],
+                        x=list(metrics), y=series['name'],
+                        colorscale='Viridis', hovertemplate="%{y} %{x}: %{z:.1f}<extra></extra>"
+                    ),
+                    layout=go.Layout(title="Metric Comparison across Projects")
+                )
+                # A stable key lets Streamlit update the existing chart instead of remounting it
+                st.plotly_chart(fig, use_container_width=True, key="portfolio_heatmap")
                 
         with col_files:
             st.subheader("🔥 Top Portfolio Risks")
             if p['top_risky_files']:
-                st.table(pd.DataFrame(p['top_risky_files']))
+                st.table(p['top_risky_files'])
             else:
                 st.write("No high-risk files detected.")
     else:
         st.warning("Could not fetch portfolio data. Ensure API is running.")
 
-elif mode == "Repository Deep-Dive":
-    if not repos:
-        st.warning("No repositories found in database.")
-    else:
-        repo_names = [r['name'] for r in repos]
-        selected_repo_name = st.sidebar.selectbox("Select Repository", repo_names)
-        selected_repo = next(r for r in repos if r['name'] == selected_repo_name)
-        
-        st.header(f"🔍 Deep-Dive: {selected_repo['name']}")
-        st.info(f"Path: {selected_repo['path']} | Last Analyzed: {selected_repo['last_analyzed']}")
-
-        # Fetch Trends
-        trends_resp = requests.get(f"{API_URL}/repositories/{selected_repo['name']}/trends")
-        if trends_resp.status_code == 200:
-            trends = trends_resp.json()
-            if trends['dates']:
-                df_trends = pd.DataFrame({
-                    'Time': trends['dates'],
-                    'Health': trends['health'],
-                    'Coherence': trends['coherence'],
-                    'Risk': trends['risk']
-                })
-                
-                # Metrics
-                m1, m2, m3 = st.columns(3)
-                m1.metric("Health", f"{trends['health'][-1]:.1f}")
-                m2.metric("Coherence", f"{trends['coherence'][-1]:.1f}")
-                m3.metric("Risk", f"{trends['risk'][-1]:.1f}", delta_color="inverse")
-                
-                st.subheader("Historical Evolution")
-                fig = px.line(df_trends, x='Time', y=['Health', 'Coherence', 'Risk'],
-                             title="Metric Trends Over Time")
-                st.plotly_chart(fig, use_container_width=True)
-
-        st.markdown("---")
-        # Latest Details
-        results_resp = requests.get(f"{API_URL}/repositories/{selected_repo['name']}/results?limit=1")
-        if results_resp.status_code == 200 and results_resp.json():
-            latest = results_resp.json()[0]['data']
+@st.fragment
+def deep_dive(selected_repo):
+    import plotly.graph_objects as go
+    st.header(f"🔍 Deep-Dive: {selected_repo['name']}")
+    st.info(f"Path: {selected_repo['path']} | Last Analyzed: {selected_repo['last_analyzed']}")
+
+    # One round trip for every section; the benchmarks view reuses the cached bundle
+    bundle = api_get(f"/repositories/{selected_repo['name']}/bundle")
+
+    trends = bundle['trends'] if bundle is not None else None
+    if trends is not None and trends['dates']:
+        metric_tiles([
+            ("Health", f"{trends['health'][-1]:.1f}"),
+            ("Coherence", f"{trends['coherence'][-1]:.1f}"),
+            ("Risk", f"{trends['risk'][-1]:.1f}")
+        ])
+
+    # Unlike st.tabs, which runs every tab's body, a selector builds only the visible
+    # section; switching reruns just this fragment
+    section = st.radio("Section", DEEP_DIVE_SECTIONS, horizontal=True, label_visibility="collapsed", key="deep_dive_section")
+
+    if section == "Historical Evolution":
+        if trends is not None and trends['dates']:
+            st.subheader("Historical Evolution")
+            # WebGL traces keep long histories cheap to draw
+            fig = go.Figure(
+                data=[go.Scattergl(x=trends['dates'], y=trends[col.lower()], name=col, mode='lines') for col in ('Health', 'Coherence', 'Risk')],
+                layout=go.Layout(title="Metric Trends Over Time")
+            )
+            st.plotly_chart(fig, use_container_width=True, key="trends_line")
+
+    elif section == "Latest Details":
+        if bundle is not None:
+            latest = bundle['latest']['data'] or {}
             d1, d2 = st.columns(2)
             with d1:
                 st.write("**Recent Prompt Artifacts**")
                 prompts = latest.get('prompts', [])
                 if prompts:
-                    st.dataframe(pd.DataFrame(prompts))
+                    st.dataframe(prompts)
             with d2:
                 st.write("**Code Hotspots**")
                 hotspots = latest.get('hotspots', [])
                 if hotspots:
-                    df_h = pd.DataFrame(hotspots).rename(columns={'filepath': 'File', 'change_count': 'Commits'})
-                    st.bar_chart(df_h[['File', 'Commits']].set_index('File'))
+                    st.bar_chart(hotspot_frame(hotspots))
 
-        st.markdown("---")
+    else:
         st.subheader("💡 Actionable Insights")
-        rec_resp = requests.get(f"{API_URL}/repositories/{selected_repo['name']}/recommendations")
-        if rec_resp.status_code == 200:
-            recs = rec_resp.json()
+        recs = bundle['recommendations'] if bundle is not None else None
+        if recs is not None:
             if not recs:
                 st.write("No urgent recommendations at this time. Great job!")
             else:
                 for r in recs:
                     with st.expander(f"{r['severity'].upper()}: {r['title']}"):
-                        st.write(f"**Description:** {r['description']}")
-                        st.write(f"**Action:** {r['action_item']}")
-                        st.write(f"**Rationale:** {r['rationale']}")
+                        st.markdown(f"**Description:** {r['description']}\n\n**Action:** {r['action_item']}\n\n**Rationale:** {r['rationale']}")
                         st.info(f"Affected Areas: {', '.join(r['affected_areas'])}")
         else:
             st.error("Could not fetch recommendations.")
 
-elif mode == "Industry Benchmarks":
-    if not repos:
-        st.warning("No repositories found.")
-    else:
-        repo_names = [r['name'] for r in repos]
-        selected_repo_name = st.sidebar.selectbox("Select Repository to Benchmark", repo_names)
-        
-        st.header(f"📊 Industry Benchmarking: {selected_repo_name}")
+@st.fragment
+def benchmarks_view(selected_repo_name):
+    st.header(f"📊 Industry Benchmarking: {selected_repo_name}")
+    
+    bundle = api_get(f"/repositories/{selected_repo_name}/bundle")
+    if bundle is not None:
+        benchmarks = bundle['benchmarks']
         
-        bench_resp = requests.get(f"{API_URL}/repositories/{selected_repo_name}/benchmarks")
-        if bench_resp.status_code == 200:
-            benchmarks = bench_resp.json()
+        for b in benchmarks:
+            st.subheader(f"Metric: {b['metric_name'].replace('_', ' ').title()}")
+            col_m, col_g = st.columns([1, 2])
             
-            for b in benchmarks:
-                st.subheader(f"Metric: {b['metric_name'].replace('_', ' ').title()}")
-                col_m, col_g = st.columns([1, 2])
-                
-                with col_m:
-                    st.metric("Your Score", f"{b['repo_value']:.2f}")
-                    st.write(f"**Industry Average:** {b['industry_avg']:.1f}")
-                    st.write(f"**Percentile ranking:** {b['percentile']:.1f}%")
-                    
-                    if b['rating'] == 'Excellence': st.success("🌟 " + b['rating'])
-                    elif b['rating'] in ['Strong', 'Standard']: st.info("✅ " + b['rating'])
-                    else: st.warning("⚠️ " + b['rating'])
+            with col_m:
+                metric_tiles([("Your Score", f"{b['repo_value']:.2f}")])
+                st.markdown(f"**Industry Average:** {b['industry_avg']:.1f}  \n**Percentile ranking:** {b['percentile']:.1f}%")
                 
-                with col_g:
-                    # Simple gauge-like bar
-                    st.progress(max(0, min(int(b['percentile']), 100)))
-                st.markdown("---")
-        else:
-            st.error("Failed to fetch benchmarks.")
+                if b['rating'] == 'Excellence': st.success("🌟 " + b['rating'])
+                elif b['rating'] in ['Strong', 'Standard']: st.info("✅ " + b['rating'])
+                else: st.warning("⚠️ " + b['rating'])
+            
+            with col_g:
+                # Simple gauge-like bar
+                st.progress(max(0, min(int(b['percentile']), 100)))
+            st.markdown("---")
+    else:
+        st.error("Failed to fetch benchmarks.")
 
-elif mode == "Artifact Explorer":
+@st.fragment
+def artifact_explorer():
+    import pyarrow as pa
     st.header("🔍 Cross-Repository Artifact Explorer")
     st.markdown("Search through all historical commits, prompts, and file risks.")
     
-    q = st.text_input("Search query (e.g. 'refactor', 'API', 'model')")
-    cat = st.selectbox("Category", ["all", "prompt", "commit", "file"])
+    # A form submits once per search instead of rerunning on every keystroke
+    with st.form("search", clear_on_submit=False):
+        q = st.text_input("Search query (e.g. 'refactor', 'API', 'model')")
+        cat = st.selectbox("Category", ["all", "prompt", "commit", "file"])
+        st.form_submit_button("Search")
     
     if q:
-        search_resp = requests.get(f"{API_URL}/search", params={"query": q, "category": cat})
-        if search_resp.status_code == 200:
-            results = search_resp.json()
+        # Only the visible page is fetched; st.dataframe virtualizes its rows
+        # A new query or category starts again at page 1; one key, so old searches leave nothing behind
+        if st.session_state.get("search-last") != (q, cat):
+            st.session_state["search-last"] = (q, cat)
+            st.session_state["search-page"] = 1
+        page = st.number_input("Page", min_value=1, step=1, key="search-page")
+        offset = (page - 1) * SEARCH_PAGE_SIZE
+        results = api_get("/search", {"query": q, "category": cat, "limit": SEARCH_PAGE_SIZE, "offset": offset})
+        if results is not None:
             if results:
-                st.write(f"Found {len(results)} results:")
-                df_res = pd.DataFrame(results)
-                st.table(df_res)
+                st.write(f"Showing results {offset + 1}-{offset + len(results)}:")
+                # Columnar Arrow table: no object-dtype frame, and Streamlit ships it to the browser as-is
+                st.dataframe(pa.Table.from_pylist(results), use_container_width=True, hide_index=True)
+            elif page > 1:
+                st.info("No more results.")
             else:
                 st.info("No matching artifacts found.")
         else:
             st.error("Search failed.")
+
+if mode == "Portfolio Overview":
+    portfolio_view()
+
+elif mode == "Repository Deep-Dive":
+    if not repos:
+        st.warning("No repositories found in database.")
+    else:
+        by_name = repos_by_name(repos)
+        selected_repo_name = st.sidebar.selectbox("Select Repository", list(by_name))
+        selected_repo = by_name[selected_repo_name]
+        deep_dive(selected_repo)
+
+elif mode == "Industry Benchmarks":
+    if not repos:
+        st.warning("No repositories found.")
+    else:
+        selected_repo_name = st.sidebar.selectbox("Select Repository to Benchmark", list(repos_by_name(repos)))
+        benchmarks_view(selected_repo_name)
+
+elif mode == "Artifact Explorer":
+    artifact_explorer()